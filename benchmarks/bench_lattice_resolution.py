@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Measures lattice latency and accuracy at different resolutions.
+
+Each lattice fixture from tests/test_common.py is parsed at every
+resolution, and the output is compared against the expected data
+from tests/data.py.
+
+Usage: python benchmarks/bench_lattice_resolution.py [resolution ...]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+import camelot
+
+
+here = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(here, ".."))
+from tests.data import (  # noqa: E402
+    data_lattice,
+    data_lattice_table_rotated,
+    data_lattice_two_tables_1,
+    data_lattice_two_tables_2,
+    data_lattice_table_regions,
+    data_lattice_table_areas,
+    data_lattice_process_background,
+    data_lattice_copy_text,
+    data_lattice_shift_text_left_top,
+    data_arabic,
+)
+
+testdir = os.path.join(here, "..", "tests", "files")
+
+# (filename, kwargs, {table index: expected data})
+cases = [
+    (
+        "tabula/icdar2013-dataset/competition-dataset-us/us-030.pdf",
+        {"pages": "2"},
+        {0: data_lattice},
+    ),
+    ("clockwise_table_1.pdf", {}, {0: data_lattice_table_rotated}),
+    ("anticlockwise_table_1.pdf", {}, {0: data_lattice_table_rotated}),
+    (
+        "twotables_2.pdf",
+        {},
+        {0: data_lattice_two_tables_1, 1: data_lattice_two_tables_2},
+    ),
+    (
+        "table_region.pdf",
+        {"table_regions": ["170,370,560,270"]},
+        {0: data_lattice_table_regions},
+    ),
+    (
+        "twotables_2.pdf",
+        {"table_areas": ["80,693,535,448"]},
+        {0: data_lattice_table_areas},
+    ),
+    (
+        "background_lines_1.pdf",
+        {"process_background": True},
+        {1: data_lattice_process_background},
+    ),
+    (
+        "row_span_1.pdf",
+        {"line_scale": 60, "copy_text": "v"},
+        {0: data_lattice_copy_text},
+    ),
+    ("column_span_2.pdf", {"line_scale": 40}, {0: data_lattice_shift_text_left_top}),
+    ("tabula/arabic.pdf", {}, {0: data_arabic}),
+]
+
+
+def run(resolution):
+    elapsed, correct, expected, accuracy = 0, 0, 0, []
+    for filename, kwargs, tables_expected in cases:
+        filepath = os.path.join(testdir, filename)
+        start = time.time()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            tables = camelot.read_pdf(filepath, resolution=resolution, **kwargs)
+        elapsed += time.time() - start
+        accuracy.extend([t.accuracy for t in tables])
+        for idx, data in tables_expected.items():
+            expected += 1
+            if idx < len(tables) and pd.DataFrame(data).equals(tables[idx].df):
+                correct += 1
+    mean_accuracy = sum(accuracy) / len(accuracy) if accuracy else 0
+    return elapsed, correct, expected, mean_accuracy
+
+
+def main(resolutions):
+    print(
+        "{:>10} {:>10} {:>16} {:>14}".format(
+            "resolution", "time (s)", "tables correct", "mean accuracy"
+        )
+    )
+    for resolution in resolutions:
+        elapsed, correct, expected, mean_accuracy = run(resolution)
+        print(
+            "{:>10} {:>10.2f} {:>16} {:>14.2f}".format(
+                resolution, elapsed, "{}/{}".format(correct, expected), mean_accuracy
+            )
+        )
+
+
+if __name__ == "__main__":
+    resolutions = [r if r == "auto" else int(r) for r in sys.argv[1:]]
+    main(resolutions or [72, 150, 300, "auto"])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Compares splitting a large PDF into single page PDFs when the PDF
+is read with file reads and when it is memory-mapped.
+
+A synthetic PDF is built by repeating the pages of
+tests/files/tabula/schools.pdf, and every page is then split from it
+in memory, with use_mmap set to False and to True. The wall time is
+reported along with the number of read syscalls and bytes read, which
+are taken from /proc/self/io on Linux. The file is read once before
+timing so that both runs read from the OS page cache.
+
+Usage: python benchmarks/bench_mmap.py [n_pages] [repeat]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from camelot.handlers import PDFHandler
+from camelot.utils import TemporaryDirectory
+
+
+here = os.path.abspath(os.path.dirname(__file__))
+source = os.path.join(here, "..", "tests", "files", "tabula", "schools.pdf")
+
+
+def make_pdf(filepath, n_pages):
+    with open(source, "rb") as f:
+        infile = PdfFileReader(f, strict=False)
+        pages = [infile.getPage(i) for i in range(infile.getNumPages())]
+        outfile = PdfFileWriter()
+        for i in range(n_pages):
+            outfile.addPage(pages[i % len(pages)])
+        with open(filepath, "wb") as g:
+            outfile.write(g)
+
+
+def read_io():
+    """Returns the number of read syscalls and bytes read by this
+    process, or None if /proc/self/io is not available.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+    except (IOError, OSError):
+        return None
+    return int(counters["syscr"]), int(counters["rchar"])
+
+
+def split(filepath, use_mmap):
+    handler = PDFHandler(filepath, pages="all", use_mmap=use_mmap)
+    infile = handler._get_infile()
+    pages = handler.pages
+    for p in pages:
+        handler._write_page(infile.getPage(p - 1), "page-{}.pdf".format(p))
+    handler.close()
+    return len(pages)
+
+
+def measure(filepath, use_mmap, repeat):
+    before = read_io()
+    start = time.time()
+    for __ in range(repeat):
+        split(filepath, use_mmap)
+    elapsed = (time.time() - start) / repeat
+    after = read_io()
+    if before is None or after is None:
+        return elapsed, None, None
+    syscr = (after[0] - before[0]) // repeat
+    rchar = (after[1] - before[1]) // repeat
+    return elapsed, syscr, rchar
+
+
+def main(n_pages, repeat):
+    with TemporaryDirectory() as tempdir:
+        filepath = os.path.join(tempdir, "synthetic-{}.pdf".format(n_pages))
+        make_pdf(filepath, n_pages)
+        # warm the OS page cache
+        with open(filepath, "rb") as f:
+            while f.read(1024 * 1024):
+                pass
+        print("{} pages, {:.1f} MB".format(n_pages, os.path.getsize(filepath) / 1e6))
+        print(
+            "{:>8} {:>10} {:>14} {:>12}".format(
+                "", "time (s)", "read syscalls", "bytes read"
+            )
+        )
+        for name, use_mmap in [("read", False), ("mmap", True)]:
+            elapsed, syscr, rchar = measure(filepath, use_mmap, repeat)
+            print(
+                "{:>8} {:>10.2f} {:>14} {:>12}".format(
+                    name,
+                    elapsed,
+                    "n/a" if syscr is None else syscr,
+                    "n/a" if rchar is None else rchar,
+                )
+            )
+
+
+if __name__ == "__main__":
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    main(n_pages, repeat)
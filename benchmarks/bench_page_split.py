@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Measures the cost of splitting a PDF into single page PDFs.
+
+A synthetic PDF is built by repeating the first page of
+tests/files/foo.pdf, and then every page is saved using
+PDFHandler._save_page. Since the source PDF is parsed only once,
+the time per page should stay flat as the number of pages grows.
+
+Usage: python benchmarks/bench_page_split.py [n_pages ...]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from camelot.handlers import PDFHandler
+from camelot.utils import TemporaryDirectory
+
+
+here = os.path.abspath(os.path.dirname(__file__))
+source = os.path.join(here, "..", "tests", "files", "foo.pdf")
+
+
+def make_pdf(filepath, n_pages):
+    with open(source, "rb") as f:
+        page = PdfFileReader(f, strict=False).getPage(0)
+        outfile = PdfFileWriter()
+        for __ in range(n_pages):
+            outfile.addPage(page)
+        with open(filepath, "wb") as g:
+            outfile.write(g)
+
+
+def time_split(filepath):
+    start = time.time()
+    handler = PDFHandler(filepath, pages="all")
+    with TemporaryDirectory() as tempdir:
+        for p in handler.pages:
+            handler._save_page(p, tempdir)
+    handler.close()
+    return time.time() - start
+
+
+def main(sizes):
+    print("{:>8} {:>10} {:>14}".format("pages", "total (s)", "per page (ms)"))
+    with TemporaryDirectory() as tempdir:
+        for n_pages in sizes:
+            filepath = os.path.join(tempdir, "synthetic-{}.pdf".format(n_pages))
+            make_pdf(filepath, n_pages)
+            elapsed = time_split(filepath)
+            print(
+                "{:>8} {:>10.2f} {:>14.2f}".format(
+                    n_pages, elapsed, 1000 * elapsed / n_pages
+                )
+            )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [25, 50, 100, 200]
+    main(sizes)
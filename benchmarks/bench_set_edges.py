@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Compares Table.set_edges with the scalar implementation it replaced.
+
+Every lattice fixture from tests/test_common.py is parsed once, and
+the arguments of each Table.set_edges call are recorded. Both
+implementations are then timed on the recorded calls. The fixtures are
+parsed again with the scalar implementation to check that every table
+gets the same data.
+
+Usage: python benchmarks/bench_set_edges.py [raster|vector] [repeat]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+import camelot
+from camelot.core import Table
+
+
+here = os.path.abspath(os.path.dirname(__file__))
+testdir = os.path.join(here, "..", "tests", "files")
+
+# (filename, kwargs)
+cases = [
+    ("tabula/icdar2013-dataset/competition-dataset-us/us-030.pdf", {"pages": "2"}),
+    ("clockwise_table_1.pdf", {}),
+    ("anticlockwise_table_1.pdf", {}),
+    ("twotables_2.pdf", {}),
+    ("table_region.pdf", {"table_regions": ["170,370,560,270"]}),
+    ("twotables_2.pdf", {"table_areas": ["80,693,535,448"]}),
+    ("background_lines_1.pdf", {"process_background": True}),
+    ("row_span_1.pdf", {"line_scale": 60, "copy_text": "v"}),
+    ("column_span_2.pdf", {"line_scale": 40}),
+    ("tabula/arabic.pdf", {}),
+]
+
+
+def set_edges_scalar(self, vertical, horizontal, joint_tol=2):
+    """Table.set_edges as it was before segments were matched to the
+    grid using array operations.
+    """
+    for v in vertical:
+        i = [
+            i for i, t in enumerate(self.cols) if np.isclose(v[0], t[0], atol=joint_tol)
+        ]
+        j = [
+            j for j, t in enumerate(self.rows) if np.isclose(v[3], t[0], atol=joint_tol)
+        ]
+        k = [
+            k for k, t in enumerate(self.rows) if np.isclose(v[1], t[0], atol=joint_tol)
+        ]
+        if not j:
+            continue
+        J = j[0]
+        K = k[0] if k else len(self.rows)
+        while J < K:
+            if i == [0]:
+                self._left[J, 0] = True
+            elif i == []:
+                self._right[J, len(self.cols) - 1] = True
+            else:
+                self._left[J, i[0]] = True
+                self._right[J, i[0] - 1] = True
+            J += 1
+
+    for h in horizontal:
+        i = [
+            i for i, t in enumerate(self.rows) if np.isclose(h[1], t[0], atol=joint_tol)
+        ]
+        j = [
+            j for j, t in enumerate(self.cols) if np.isclose(h[0], t[0], atol=joint_tol)
+        ]
+        k = [
+            k for k, t in enumerate(self.cols) if np.isclose(h[2], t[0], atol=joint_tol)
+        ]
+        if not j:
+            continue
+        J = j[0]
+        K = k[0] if k else len(self.cols)
+        while J < K:
+            if i == [0]:
+                self._top[0, J] = True
+            elif i == []:
+                self._bottom[len(self.rows) - 1, J] = True
+            else:
+                self._top[i[0], J] = True
+                self._bottom[i[0] - 1, J] = True
+            J += 1
+
+    return self
+
+
+def parse_all(line_source):
+    data = []
+    for filename, kwargs in cases:
+        filepath = os.path.join(testdir, filename)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            tables = camelot.read_pdf(filepath, line_source=line_source, **kwargs)
+        data.extend([t.data for t in tables])
+    return data
+
+
+def record_calls(line_source):
+    calls = []
+    set_edges = Table.set_edges
+
+    def recorder(self, vertical, horizontal, joint_tol=2):
+        calls.append((self.cols, self.rows, vertical, horizontal, joint_tol))
+        return set_edges(self, vertical, horizontal, joint_tol=joint_tol)
+
+    Table.set_edges = recorder
+    try:
+        data = parse_all(line_source)
+    finally:
+        Table.set_edges = set_edges
+    return calls, data
+
+
+def time_calls(func, calls, repeat):
+    start = time.time()
+    for __ in range(repeat):
+        for cols, rows, vertical, horizontal, joint_tol in calls:
+            func(Table(cols, rows), vertical, horizontal, joint_tol=joint_tol)
+    return time.time() - start
+
+
+def main(line_source, repeat):
+    calls, data = record_calls(line_source)
+
+    set_edges = Table.set_edges
+    Table.set_edges = set_edges_scalar
+    try:
+        data_scalar = parse_all(line_source)
+    finally:
+        Table.set_edges = set_edges
+
+    scalar = time_calls(set_edges_scalar, calls, repeat)
+    vectorized = time_calls(Table.set_edges, calls, repeat)
+    n_calls = len(calls) * repeat
+    print("{:>12} {:>10} {:>14}".format("", "total (s)", "per call (ms)"))
+    for name, elapsed in [("scalar", scalar), ("vectorized", vectorized)]:
+        print(
+            "{:>12} {:>10.3f} {:>14.3f}".format(name, elapsed, 1000 * elapsed / n_calls)
+        )
+    print("speedup: {:.1f}x".format(scalar / vectorized))
+    print("identical table.data: {} ({} tables)".format(data == data_scalar, len(data)))
+
+
+if __name__ == "__main__":
+    line_source = sys.argv[1] if len(sys.argv) > 1 else "raster"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    main(line_source, repeat)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Compares the tolerance comparisons used to group rows, merge
+columns and merge lines with the np.isclose based implementations
+they replaced.
+
+Each function is run on the same synthetic inputs as its previous
+implementation, which is kept below, and the outputs are checked to be
+equal.
+
+Usage: python benchmarks/bench_tolerance.py [n_values ...]
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from camelot.parsers import Stream
+from camelot.utils import merge_close_lines
+
+
+class TextLine(object):
+    def __init__(self, x0, y0, x1, y1, text):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.text = text
+
+    def get_text(self):
+        return self.text
+
+
+def group_rows_np(text, row_tol=2):
+    row_y = 0
+    rows = []
+    temp = []
+    for t in text:
+        if t.get_text().strip():
+            if not np.isclose(row_y, t.y0, atol=row_tol):
+                rows.append(sorted(temp, key=lambda t: t.x0))
+                temp = []
+                row_y = t.y0
+            temp.append(t)
+    rows.append(sorted(temp, key=lambda t: t.x0))
+    __ = rows.pop(0)
+    return rows
+
+
+def merge_columns_np(l, column_tol=0):
+    merged = []
+    for higher in l:
+        if not merged:
+            merged.append(higher)
+        else:
+            lower = merged[-1]
+            if column_tol >= 0:
+                if higher[0] <= lower[1] or np.isclose(
+                    higher[0], lower[1], atol=column_tol
+                ):
+                    upper_bound = max(lower[1], higher[1])
+                    lower_bound = min(lower[0], higher[0])
+                    merged[-1] = (lower_bound, upper_bound)
+                else:
+                    merged.append(higher)
+            elif column_tol < 0:
+                if higher[0] <= lower[1]:
+                    if np.isclose(higher[0], lower[1], atol=abs(column_tol)):
+                        merged.append(higher)
+                    else:
+                        upper_bound = max(lower[1], higher[1])
+                        lower_bound = min(lower[0], higher[0])
+                        merged[-1] = (lower_bound, upper_bound)
+                else:
+                    merged.append(higher)
+    return merged
+
+
+def merge_close_lines_np(ar, line_tol=2):
+    ret = []
+    for a in ar:
+        if not ret:
+            ret.append(a)
+        else:
+            temp = ret[-1]
+            if np.isclose(temp, a, atol=line_tol):
+                temp = (temp + a) / 2.0
+                ret[-1] = temp
+            else:
+                ret.append(a)
+    return ret
+
+
+def make_inputs(n):
+    text, y = [], 800.0
+    for __ in range(n):
+        y -= random.choice([0, 0.5, 1.5, 2, 3, 12])
+        x0 = random.uniform(0, 500)
+        text.append(
+            TextLine(x0, y, x0 + random.uniform(2, 80), y + 8, random.choice(["", "a"]))
+        )
+    cols = sorted(
+        (x, x + random.uniform(0, 10))
+        for x in [random.uniform(0, 600) for __ in range(n)]
+    )
+    lines = sorted(
+        [random.uniform(0, 600) for __ in range(n // 2)]
+        + [random.choice(range(0, 600, 3)) for __ in range(n // 2)]
+    )
+    return text, cols, lines
+
+
+def compare(name, old, new, args, repeat=5):
+    start = time.time()
+    for __ in range(repeat):
+        expected = old(*args)
+    old_elapsed = (time.time() - start) / repeat
+    start = time.time()
+    for __ in range(repeat):
+        result = new(*args)
+    new_elapsed = (time.time() - start) / repeat
+    print(
+        "{:>16} {:>12.2f} {:>12.2f} {:>8.1f}x {:>6}".format(
+            name,
+            1000 * old_elapsed,
+            1000 * new_elapsed,
+            old_elapsed / new_elapsed,
+            str(result == expected),
+        )
+    )
+
+
+def main(sizes):
+    random.seed(0)
+    print(
+        "{:>16} {:>12} {:>12} {:>9} {:>6}".format(
+            "", "np (ms)", "new (ms)", "speedup", "equal"
+        )
+    )
+    for n in sizes:
+        print("n = {}".format(n))
+        text, cols, lines = make_inputs(n)
+        compare("group_rows", group_rows_np, Stream._group_rows, (text, 2))
+        for column_tol in [0, 3, -3]:
+            compare(
+                "merge_columns {}".format(column_tol),
+                merge_columns_np,
+                Stream._merge_columns,
+                (cols, column_tol),
+            )
+        compare("merge_lines", merge_close_lines_np, merge_close_lines, (lines, 2))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 1000, 10000]
+    main(sizes)
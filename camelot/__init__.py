@@ -3,7 +3,7 @@
 import logging
 
 from .__version__ import __version__
-from .io import read_pdf
+from .io import read_pdf, iter_pdf, sweep
 from .plotting import PlotMethods
 
 
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Asyncio API of camelot, which requires Python 3.5+.
+
+Downloading, splitting and parsing a PDF are awaitable stages, so
+that extraction can run inside an asyncio application without blocking
+its event loop. I/O runs in the default executor of the event loop,
+while pages are parsed in a configurable executor, a few at a time.
+"""
+
+import os
+import shutil
+import asyncio
+import logging
+import tempfile
+import warnings
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .core import TableList
+from .handlers import PDFHandler, _parse_page, _parse_page_in_process
+from .parsers import Stream, Lattice
+from .utils import validate_input, remove_extra, is_url, download_url
+
+
+logger = logging.getLogger("camelot")
+
+
+def _parse_page_in_thread(args):
+    """Parses a single page PDF inside a worker thread. Unlike
+    camelot.handlers._parse_page_in_process, the logger and warning
+    filters, which are shared by all threads, are left untouched and
+    warnings and logs are emitted from the worker thread.
+    """
+    return _parse_page(*args), [], []
+
+
+async def read_pdf(
+    filepath,
+    pages="1",
+    password=None,
+    flavor="lattice",
+    suppress_stdout=False,
+    layout_kwargs={},
+    executor=None,
+    concurrency=None,
+    use_mmap=False,
+    **kwargs
+):
+    """Read PDF and return extracted tables, without blocking the
+    event loop.
+
+    The PDF is downloaded if filepath is a URL, then split into single
+    page PDFs which are checked for rotation and parsed in executor.
+    At most concurrency pages are split or parsed at a time. If the
+    coroutine is cancelled, pages that are not being parsed yet are
+    cancelled, and temp files, including a downloaded PDF, are removed
+    once the pages being parsed are done.
+
+    Parameters
+    ----------
+    filepath : str, bytes or file-like object
+        Filepath or URL of the PDF file, or its contents, see
+        camelot.read_pdf.
+    pages : str, optional (default: '1')
+        Comma-separated page numbers.
+        Example: '1,3,4' or '1,4-end' or 'all'.
+    password : str, optional (default: None)
+        Password for decryption.
+    flavor : str (default: 'lattice')
+        The parsing method to use ('lattice' or 'stream').
+        Lattice is used by default.
+    suppress_stdout : bool, optional (default: True)
+        Print all logs and warnings.
+    layout_kwargs : dict, optional (default: {})
+        A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+    executor : concurrent.futures.Executor, optional (default: None)
+        Executor in which pages are parsed. A process pool with
+        concurrency workers is created for the call if it is None.
+        With a thread pool, warnings are emitted from the worker
+        threads and suppress_stdout only suppresses logs.
+    concurrency : int, optional (default: None)
+        Maximum number of pages that are parsed at a time.
+        Defaults to the number of CPUs.
+    use_mmap : bool, optional (default: False)
+        Memory-map the PDF file, see camelot.read_pdf.
+    kwargs : dict
+        See camelot.read_pdf kwargs.
+
+    Returns
+    -------
+    tables : camelot.core.TableList
+
+    """
+    if flavor not in ["lattice", "stream"]:
+        raise NotImplementedError(
+            "Unknown flavor specified." " Use either 'lattice' or 'stream'"
+        )
+    validate_input(kwargs, flavor=flavor)
+    kwargs = remove_extra(kwargs, flavor=flavor)
+    parser_class = Lattice if flavor == "lattice" else Stream
+    # build a parser eagerly to raise on invalid kwargs
+    parser_class(**kwargs)
+    if concurrency is None:
+        concurrency = multiprocessing.cpu_count()
+
+    loop = asyncio.get_event_loop()
+    download = None
+    downloaded = None
+    handler = None
+    tempdir = None
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=concurrency)
+    if isinstance(executor, ThreadPoolExecutor):
+        parse = _parse_page_in_thread
+    else:
+        parse = _parse_page_in_process
+    # executor jobs keep running when the coroutine awaiting them is
+    # cancelled, and have to be done before their files are removed
+    running = set()
+
+    async def run(executor, func, *args):
+        future = loop.run_in_executor(executor, func, *args)
+        running.add(future)
+        future.add_done_callback(running.discard)
+        return await asyncio.shield(future)
+
+    try:
+        if is_url(filepath):
+            download = loop.run_in_executor(None, download_url, filepath)
+            running.add(download)
+            filepath = downloaded = await asyncio.shield(download)
+        handler = await run(
+            None,
+            lambda: PDFHandler(
+                filepath, pages=pages, password=password, use_mmap=use_mmap
+            ),
+        )
+        tempdir = tempfile.mkdtemp()
+
+        def split_page(p):
+            fname = "page-{}.pdf".format(p)
+            return handler._write_page(handler._get_page(p), fname, tempdir)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        # pages are split from a PDF reader that is shared by all pages
+        # and can't be used by several threads at once
+        split_lock = asyncio.Lock()
+
+        async def parse_page(p):
+            async with semaphore:
+                async with split_lock:
+                    page = await run(None, split_page, p)
+                # parsers keep the state of the page they parse, so each
+                # page gets its own
+                parser = parser_class(**kwargs)
+                args = (parser, page, suppress_stdout, layout_kwargs)
+                tables, caught, records = await run(executor, parse, args)
+            for record in records:
+                logger.handle(record)
+            with warnings.catch_warnings():
+                if suppress_stdout:
+                    warnings.simplefilter("ignore")
+                for message, category, filename, lineno in caught:
+                    warnings.warn_explicit(message, category, filename, lineno)
+            handler._remove_page(page, tempdir)
+            return tables
+
+        # pages of open-ended ranges are looked up in the PDF
+        page_numbers = await run(None, lambda: handler.pages)
+        tasks = [asyncio.ensure_future(parse_page(p)) for p in page_numbers]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    finally:
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        if (
+            downloaded is None
+            and download is not None
+            and not download.cancelled()
+            and download.exception() is None
+        ):
+            # the coroutine was cancelled while the PDF was downloaded
+            downloaded = download.result()
+        if own_executor:
+            executor.shutdown(wait=False)
+        if handler is not None:
+            handler.close()
+        if tempdir is not None:
+            shutil.rmtree(tempdir, ignore_errors=True)
+        if downloaded is not None and os.path.exists(downloaded):
+            os.remove(downloaded)
+
+    return TableList(sorted([table for tables in results for table in tables]))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from .ghostscript_backend import GhostscriptBackend, SubprocessGhostscriptBackend
+from ..utils import string_types
+
+
+BACKENDS = {
+    "ghostscript": GhostscriptBackend,
+    "ghostscript_subprocess": SubprocessGhostscriptBackend,
+}
+
+# backends created by name are shared so that the limits they put on
+# concurrent renders apply across all parsers
+_backends = {}
+
+
+def get_backend(backend):
+    """Returns the backend used to render PDF pages as images.
+
+    Parameters
+    ----------
+    backend : str or object
+        Name of a backend, {'ghostscript', 'ghostscript_subprocess'},
+        or an object with a render method like
+        camelot.backends.GhostscriptBackend.
+
+    Returns
+    -------
+    backend : object
+
+    """
+    if not isinstance(backend, string_types):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            "Unknown backend '{}', use one of {}".format(
+                backend, ", ".join(sorted(BACKENDS))
+            )
+        )
+    if backend not in _backends:
+        _backends.setdefault(backend, BACKENDS[backend]())
+    return _backends[backend]
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+
+from ..image_processing import decode_grayscale
+
+try:
+    from shutil import which
+except ImportError:  # python 2
+    from distutils.spawn import find_executable as which
+
+
+# Ghostscript only supports a single interpreter instance per process
+_lock = threading.Lock()
+
+
+def _get_gs_args(imagename, resolution, first_page=None, last_page=None):
+    """Returns the Ghostscript arguments used to render a PDF as a
+    grayscale image.
+    """
+    args = ["-q", "-sDEVICE=pgmraw", "-o", imagename, "-r{}".format(resolution)]
+    if first_page is not None:
+        args.append("-dFirstPage={}".format(first_page))
+    if last_page is not None:
+        args.append("-dLastPage={}".format(last_page))
+    return args
+
+
+def _password_arg(password):
+    return "-sPDFPassword={}".format(password)
+
+
+def _write_password_file(password):
+    """Writes the Ghostscript password argument to a file which only
+    the current user can read, and returns its path. Ghostscript reads
+    it with '@path', which keeps the password out of the arguments of
+    the process, that any local user can list.
+    """
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as f:
+        f.write('"{}"\n'.format(_password_arg(password).replace('"', '\\"')))
+    return path
+
+
+class GhostscriptBackend(object):
+    """Renders PDF pages using the Ghostscript C-API inside the
+    current process. Since Ghostscript only supports a single
+    interpreter instance per process, renders from different threads
+    are run one at a time.
+    """
+
+    def render(
+        self,
+        filepath,
+        imagename,
+        resolution,
+        first_page=None,
+        last_page=None,
+        password=None,
+    ):
+        """Renders pages of a PDF file to 8-bit grayscale PGM images.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the PDF file.
+        imagename : str
+            Path of the image file. It should contain '%d', which is
+            replaced by the page index, if more than one page is
+            rendered.
+        resolution : int
+            Resolution used for PDF to image conversion.
+        first_page : int, optional (default: None)
+            First page to render.
+        last_page : int, optional (default: None)
+            Last page to render.
+        password : str, optional (default: None)
+            Password for decryption.
+
+        """
+        from ..ext.ghostscript import Ghostscript
+
+        gs_call = _get_gs_args(
+            imagename, resolution, first_page=first_page, last_page=last_page
+        )
+        if password:
+            gs_call.append(_password_arg(password))
+        gs_call.append(filepath)
+        gs_call = [arg.encode() for arg in gs_call]
+        with _lock:
+            null = open(os.devnull, "wb")
+            with Ghostscript(*gs_call, stdout=null) as gs:
+                pass
+            null.close()
+
+
+class SubprocessGhostscriptBackend(object):
+    """Renders PDF pages by running the Ghostscript executable in a
+    subprocess, so that renders from different threads can run at the
+    same time. The password of an encrypted PDF is passed to
+    Ghostscript in a temp file that only the current user can read,
+    instead of on the command line.
+
+    Parameters
+    ----------
+    executable : str, optional (default: None)
+        Path of the Ghostscript executable. It is looked up on PATH
+        if not given.
+    max_workers : int, optional (default: None)
+        Maximum number of Ghostscript processes running at the same
+        time. Defaults to the number of CPUs.
+
+    """
+
+    def __init__(self, executable=None, max_workers=None):
+        self.executable = executable
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._semaphore = threading.BoundedSemaphore(self.max_workers)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_semaphore"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._semaphore = threading.BoundedSemaphore(self.max_workers)
+
+    def _get_executable(self):
+        if self.executable is None:
+            if sys.platform == "win32":
+                names = ["gswin64c", "gswin32c"]
+            else:
+                names = ["gs"]
+            for name in names:
+                executable = which(name)
+                if executable is not None:
+                    self.executable = executable
+                    break
+            else:
+                raise RuntimeError("Please make sure that Ghostscript is installed")
+        return self.executable
+
+    def render(
+        self,
+        filepath,
+        imagename,
+        resolution,
+        first_page=None,
+        last_page=None,
+        password=None,
+    ):
+        """Renders pages of a PDF file to 8-bit grayscale PGM images.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the PDF file.
+        imagename : str
+            Path of the image file. It should contain '%d', which is
+            replaced by the page index, if more than one page is
+            rendered.
+        resolution : int
+            Resolution used for PDF to image conversion.
+        first_page : int, optional (default: None)
+            First page to render.
+        last_page : int, optional (default: None)
+            Last page to render.
+        password : str, optional (default: None)
+            Password for decryption.
+
+        """
+        gs_call = _get_gs_args(
+            imagename, resolution, first_page=first_page, last_page=last_page
+        )
+        self._run(gs_call, filepath, password=password)
+
+    def render_array(self, filepath, resolution, password=None):
+        """Renders the first page of a PDF file to an 8-bit grayscale
+        image, which Ghostscript writes to a pipe instead of a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the PDF file.
+        resolution : int
+            Resolution used for PDF to image conversion.
+        password : str, optional (default: None)
+            Password for decryption.
+
+        Returns
+        -------
+        img : object
+            Two-dimensional numpy.ndarray representing the image.
+
+        """
+        gs_call = _get_gs_args("-", resolution, first_page=1, last_page=1)
+        # messages of the PDF interpreter go to stdout by default, where
+        # they would be mixed up with the image
+        gs_call.append("-sstdout=%stderr")
+        return decode_grayscale(self._run(gs_call, filepath, password=password))
+
+    def _run(self, gs_call, filepath, password=None):
+        password_file = None
+        if password:
+            password_file = _write_password_file(password)
+            gs_call.append("@{}".format(password_file))
+        gs_call = [self._get_executable()] + gs_call + [filepath]
+        try:
+            with self._semaphore:
+                proc = subprocess.Popen(
+                    gs_call, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+                out, err = proc.communicate()
+        finally:
+            if password_file is not None:
+                os.remove(password_file)
+        if proc.returncode != 0:
+            raise RuntimeError(
+                "Ghostscript exited with code {}: {}".format(
+                    proc.returncode, err.decode("utf-8", "replace").strip()
+                )
+            )
+        return out
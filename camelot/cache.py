@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+import os
+import copy
+import time
+import pickle
+import hashlib
+import tempfile
+
+
+# default limit on the total size of the entries in a cache directory
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
+
+# os.rename can't overwrite an existing file on Windows
+_replace = getattr(os, "replace", os.rename)
+
+
+def file_hash(filepath):
+    """Returns the SHA-256 hash of the contents of a file.
+
+    Parameters
+    ----------
+    filepath : str or file-like object
+        Path of the file, or a seekable binary file-like object which
+        is read from its start.
+
+    Returns
+    -------
+    digest : str
+        Hex digest of the file contents.
+
+    """
+    h = hashlib.sha256()
+    if hasattr(filepath, "read"):
+        filepath.seek(0)
+        for chunk in iter(lambda: filepath.read(1024 * 1024), b""):
+            h.update(chunk)
+    else:
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+class PageCache(object):
+    """Persistent cache of the data computed for each PDF page before
+    it is parsed, like its rotation, its PDFMiner layout and, for
+    lattice, the image it is rendered to.
+
+    Entries are pickled to files in a directory, which can be shared
+    by several runs and processes. They are keyed by the hash of the
+    PDF file contents and the page number, so that parsing the same
+    file again with other parser options reuses them. The least
+    recently used entries are removed once the entries in the
+    directory get larger than max_size.
+
+    Since entries are unpickled, anyone who can write to the directory
+    can run code in the processes that read from it. It should only
+    be writable by the user running camelot.
+
+    Parameters
+    ----------
+    directory : str
+        Directory in which entries are stored. It is created if it
+        doesn't exist, with permissions that only let the current
+        user access it.
+    max_size : int, optional (default: 1073741824)
+        Maximum total size of the entries in bytes.
+
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.prefix = ()
+        # estimate of the size of the entries, shared by the caches
+        # returned by for_page
+        self._size = {"bytes": None}
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+
+    def for_page(self, filehash, page):
+        """Returns a cache whose entries belong to a page.
+
+        Parameters
+        ----------
+        filehash : str
+            Hash of the PDF file contents, see camelot.cache.file_hash.
+        page : int
+            Page number.
+
+        Returns
+        -------
+        cache : camelot.cache.PageCache
+
+        """
+        cache = copy.copy(self)
+        cache.prefix = (filehash, page)
+        return cache
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(self.prefix + key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "{}.pkl".format(digest))
+
+    def get(self, *key):
+        """Returns the value stored for a key, or None if there is no
+        entry for it.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception:
+            # entries that are missing, were just evicted by another
+            # process or can't be read are all cache misses
+            return None
+        self._touch(path)
+        return value
+
+    def has(self, *key):
+        """Returns whether there is an entry for a key, without reading
+        it.
+        """
+        return os.path.exists(self._path(key))
+
+    def put(self, value, *key):
+        """Stores a value for a key, then evicts the least recently
+        used entries if the cache is larger than max_size. Values that
+        can't be pickled are not stored.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        if len(data) > self.max_size:
+            return
+        path = self._path(key)
+        if self._size["bytes"] is None:
+            self._size["bytes"] = self._scan()[1]
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        # write to a temp file first so that other processes never
+        # read a partially written entry
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            _replace(temp, path)
+        except OSError:
+            if os.path.exists(temp):
+                os.remove(temp)
+            return
+        self._touch(path)
+        # the directory is only listed once the estimate, which misses
+        # entries written by other processes, gets larger than max_size
+        self._size["bytes"] += len(data) - replaced
+        if self._size["bytes"] > self.max_size:
+            self._evict()
+
+    @staticmethod
+    def _touch(path):
+        # the modification time orders entries for eviction, it is set
+        # explicitly since file timestamps can be coarser than the time
+        # between two cache operations
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def _scan(self):
+        """Returns a list of tuples (mtime, size, path) for the entries
+        in the directory, and their total size.
+        """
+        entries = []
+        size = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            size += stat.st_size
+        return entries, size
+
+    def _evict(self):
+        entries, size = self._scan()
+        for mtime, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+        self._size["bytes"] = size
+
+
+class MemoryCache(object):
+    """Cache of the data computed for a PDF page, with the same
+    interface as camelot.cache.PageCache but kept in memory. It is
+    used to share this data between parsers with different options.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, *key):
+        """Returns the value stored for a key, or None if there is no
+        entry for it.
+        """
+        return self._entries.get(repr(key))
+
+    def has(self, *key):
+        """Returns whether there is an entry for a key."""
+        return repr(key) in self._entries
+
+    def put(self, value, *key):
+        """Stores a value for a key."""
+        self._entries[repr(key)] = value
@@ -29,6 +29,22 @@ class Config(object):
 pass_config = click.make_pass_decorator(Config)
 
 
+class Resolution(click.ParamType):
+    """Resolution for PDF to image conversion, either an integer or
+    'auto'.
+    """
+
+    name = "resolution"
+
+    def convert(self, value, param, ctx):
+        if value == "auto":
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            self.fail("{} is not an integer or 'auto'".format(value), param, ctx)
+
+
 @click.group(name="camelot")
 @click.version_option(version=__version__)
 @click.option("-q", "--quiet", is_flag=False, help="Suppress logs and warnings.")
@@ -72,6 +88,15 @@ pass_config = click.make_pass_decorator(Config)
     default=(1.0, 0.5, 0.1),
     help="PDFMiner char_margin, line_margin and word_margin.",
 )
+@click.option(
+    "-P", "--parallel", is_flag=True, help="Parse pages in parallel processes."
+)
+@click.option(
+    "-W",
+    "--workers",
+    type=int,
+    help="Number of worker processes. Defaults to the number of CPUs.",
+)
 @click.pass_context
 def cli(ctx, *args, **kwargs):
     """Camelot: PDF Table Extraction for Humans"""
@@ -161,8 +186,26 @@ def cli(ctx, *args, **kwargs):
 @click.option(
     "-res",
     "--resolution",
-    default=300,
-    help="Resolution used for PDF to PNG conversion.",
+    default="300",
+    type=Resolution(),
+    metavar="[INTEGER|auto]",
+    help="Resolution used for PDF to image conversion, or 'auto' to pick"
+    " the lowest one at which the thinnest ruling line is visible.",
+)
+@click.option(
+    "-gs",
+    "--backend",
+    default="ghostscript",
+    type=click.Choice(["ghostscript", "ghostscript_subprocess"]),
+    help="Backend used for PDF to image conversion.",
+)
+@click.option(
+    "-source",
+    "--line_source",
+    default="raster",
+    type=click.Choice(["raster", "vector"]),
+    help="Find ruling lines on an image of the page, or from the lines"
+    " drawn in the PDF.",
 )
 @click.option(
     "-plot",
@@ -202,7 +245,12 @@ def lattice(c, *args, **kwargs):
             raise click.UsageError("Please specify output file format using --format")
 
     tables = read_pdf(
-        filepath, pages=pages, flavor="lattice", suppress_stdout=quiet, **kwargs
+        filepath,
+        pages=pages,
+        flavor="lattice",
+        suppress_stdout=quiet,
+        keep_debug_data=plot_type is not None,
+        **kwargs
     )
     click.echo("Found {} tables".format(tables.n))
     if plot_type is not None:
@@ -293,7 +341,12 @@ def stream(c, *args, **kwargs):
             raise click.UsageError("Please specify output file format using --format")
 
     tables = read_pdf(
-        filepath, pages=pages, flavor="stream", suppress_stdout=quiet, **kwargs
+        filepath,
+        pages=pages,
+        flavor="stream",
+        suppress_stdout=quiet,
+        keep_debug_data=plot_type is not None,
+        **kwargs
     )
     click.echo("Found {} tables".format(tables.n))
     if plot_type is not None:
@@ -4,12 +4,15 @@ import os
 import sqlite3
 import zipfile
 import tempfile
+from bisect import bisect_left, bisect_right, insort
 from itertools import chain
 from operator import itemgetter
 
 import numpy as np
 import pandas as pd
 
+from .utils import isclose
+
 
 # minimum number of vertical textline intersections for a textedge
 # to be considered valid
@@ -64,7 +67,7 @@ class TextEdge(object):
         """Updates the text edge's x and bottom y coordinates and sets
         the is_valid attribute.
         """
-        if np.isclose(self.y0, y0, atol=edge_tol):
+        if isclose(self.y0, y0, atol=edge_tol):
             self.x = (self.intersections * self.x + x) / float(self.intersections + 1)
             self.y0 = y0
             self.intersections += 1
@@ -83,6 +86,8 @@ class TextEdges(object):
     def __init__(self, edge_tol=50):
         self.edge_tol = edge_tol
         self._textedges = {"left": [], "right": [], "middle": []}
+        # (x, index) of the text edges of each alignment sorted on x
+        self._index = {"left": [], "right": [], "middle": []}
 
     @staticmethod
     def get_x_coord(textline, align):
@@ -99,10 +104,14 @@ class TextEdges(object):
         """Returns the index of an existing text edge using
         the specified x coordinate and alignment.
         """
-        for i, te in enumerate(self._textedges[align]):
-            if np.isclose(te.x, x_coord, atol=0.5):
-                return i
-        return None
+        # search around x_coord, a bit wider than the tolerance
+        tol = 2 * (0.5 + 1e-05 * abs(x_coord))
+        index = self._index[align]
+        lo = bisect_left(index, (x_coord - tol,))
+        hi = bisect_right(index, (x_coord + tol, float("inf")))
+        matches = [i for x, i in index[lo:hi] if isclose(x, x_coord, atol=0.5)]
+        # the first text edge that was added wins
+        return min(matches) if matches else None
 
     def add(self, textline, align):
         """Adds a new text edge to the current dict.
@@ -111,6 +120,7 @@ class TextEdges(object):
         y0 = textline.y0
         y1 = textline.y1
         te = TextEdge(x, y0, y1, align=align)
+        insort(self._index[align], (te.x, len(self._textedges[align])))
         self._textedges[align].append(te)
 
     def update(self, textline):
@@ -122,16 +132,23 @@ class TextEdges(object):
             if idx is None:
                 self.add(textline, align)
             else:
-                self._textedges[align][idx].update_coords(
-                    x_coord, textline.y0, edge_tol=self.edge_tol
-                )
-
-    def generate(self, textlines):
+                te = self._textedges[align][idx]
+                x = te.x
+                te.update_coords(x_coord, textline.y0, edge_tol=self.edge_tol)
+                if te.x != x:
+                    # move the text edge to its new place in the index
+                    index = self._index[align]
+                    del index[bisect_left(index, (x, idx))]
+                    insort(index, (te.x, idx))
+
+    def generate(self, textlines, lines=None):
         """Generates the text edges dict based on horizontal text
-        rows.
+        rows. The text of text rows is looked up in lines, a
+        camelot.utils.TextLineTable, if given.
         """
         for tl in textlines:
-            if len(tl.get_text().strip()) > 1:  # TODO: hacky
+            text = tl.get_text() if lines is None else lines.get_text(tl)
+            if len(text.strip()) > 1:  # TODO: hacky
                 self.update(tl)
 
     def get_relevant(self):
@@ -310,6 +327,144 @@ class Cell(object):
         return self.top + self.bottom + self.left + self.right
 
 
+def _match_segments(positions, starts, ends, lines, points, joint_tol=2):
+    """Matches line segments to the grid of a table within a tolerance,
+    comparing all segments with all grid coordinates at once.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        Coordinate of each segment across its direction.
+    starts : numpy.ndarray
+        Coordinate of the start point of each segment, which is
+        matched with the first grid point.
+    ends : numpy.ndarray
+        Coordinate of the end point of each segment.
+    lines : numpy.ndarray
+        Coordinates of the grid lines parallel to the segments.
+    points : numpy.ndarray
+        Coordinates of the grid points along the segments.
+    joint_tol : int, optional (default: 2)
+
+    Returns
+    -------
+    L : numpy.ndarray
+        Index of the first grid line close to each segment.
+    n : numpy.ndarray
+        Number of grid lines close to each segment.
+    J : numpy.ndarray
+        Index of the first grid point close to the start point.
+    K : numpy.ndarray
+        Index of the first grid point close to the end point, or the
+        number of grid points if there is none.
+
+    Segments whose start point isn't close to any grid point are left
+    out.
+
+    """
+    i = np.isclose(positions[:, None], lines[None, :], atol=joint_tol)
+    j = np.isclose(starts[:, None], points[None, :], atol=joint_tol)
+    k = np.isclose(ends[:, None], points[None, :], atol=joint_tol)
+
+    found = j.any(axis=1)
+    i, j, k = i[found], j[found], k[found]
+    L = i.argmax(axis=1)
+    n = i.sum(axis=1)
+    J = j.argmax(axis=1)
+    K = np.where(k.any(axis=1), k.argmax(axis=1), len(points))
+    return L, n, J, K
+
+
+def _grid_property(name, doc):
+    def fget(self):
+        return bool(getattr(self._table, name)[self._r, self._c])
+
+    def fset(self, value):
+        getattr(self._table, name)[self._r, self._c] = value
+
+    return property(fget, fset, doc=doc)
+
+
+class _CellView(Cell):
+    """A cell of a camelot.core.Table whose edges, spans and text are
+    stored in the arrays of the table.
+    """
+
+    def __init__(self, table, r, c):
+        self._table = table
+        self._r = r
+        self._c = c
+
+    x1 = property(lambda self: self._table.cols[self._c][0])
+    y1 = property(lambda self: self._table.rows[self._r][1])
+    x2 = property(lambda self: self._table.cols[self._c][1])
+    y2 = property(lambda self: self._table.rows[self._r][0])
+    lb = property(lambda self: (self.x1, self.y1))
+    lt = property(lambda self: (self.x1, self.y2))
+    rb = property(lambda self: (self.x2, self.y1))
+    rt = property(lambda self: (self.x2, self.y2))
+    left = _grid_property("_left", "Whether or not cell is bounded on the left.")
+    right = _grid_property("_right", "Whether or not cell is bounded on the right.")
+    top = _grid_property("_top", "Whether or not cell is bounded on the top.")
+    bottom = _grid_property("_bottom", "Whether or not cell is bounded on the bottom.")
+    hspan = _grid_property("_hspan", "Whether or not cell spans horizontally.")
+    vspan = _grid_property("_vspan", "Whether or not cell spans vertically.")
+
+    @property
+    def text(self):
+        return self._table._cell_text[self._r, self._c]
+
+    @text.setter
+    def text(self, t):
+        self._table._cell_text[self._r, self._c] = "".join(
+            [self._table._cell_text[self._r, self._c], t]
+        )
+
+
+class _CellRow(object):
+    """A row of cells of a camelot.core.Table, which creates cell
+    views as they are accessed.
+    """
+
+    def __init__(self, table, r):
+        self._table = table
+        self._r = r
+
+    def __len__(self):
+        return len(self._table.cols)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [_CellView(self._table, self._r, c) for c in range(len(self))[idx]]
+        # wraps negative indices and raises IndexError like a list
+        return _CellView(self._table, self._r, range(len(self))[idx])
+
+    def __iter__(self):
+        for c in range(len(self)):
+            yield _CellView(self._table, self._r, c)
+
+
+class _CellGrid(object):
+    """The cells of a camelot.core.Table, which can be indexed like a
+    two-dimensional list.
+    """
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return len(self._table.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [_CellRow(self._table, r) for r in range(len(self))[idx]]
+        return _CellRow(self._table, range(len(self))[idx])
+
+    def __iter__(self):
+        for r in range(len(self)):
+            yield _CellRow(self._table, r)
+
+
 class Table(object):
     """Defines a table with coordinates relative to a left-bottom
     origin. (PDF coordinate space)
@@ -325,6 +480,9 @@ class Table(object):
 
     Attributes
     ----------
+    cells : list
+        Two-dimensional list-like of camelot.core.Cell objects, which
+        are views on the edge, span and text arrays of the table.
     df : :class:`pandas.DataFrame`
     shape : tuple
         Shape of the table.
@@ -342,7 +500,14 @@ class Table(object):
     def __init__(self, cols, rows):
         self.cols = cols
         self.rows = rows
-        self.cells = [[Cell(c[0], r[1], c[1], r[0]) for c in cols] for r in rows]
+        shape = (len(rows), len(cols))
+        self._left = np.zeros(shape, dtype=bool)
+        self._right = np.zeros(shape, dtype=bool)
+        self._top = np.zeros(shape, dtype=bool)
+        self._bottom = np.zeros(shape, dtype=bool)
+        self._hspan = np.zeros(shape, dtype=bool)
+        self._vspan = np.zeros(shape, dtype=bool)
+        self._cell_text = np.full(shape, "", dtype=object)
         self.df = None
         self.shape = (0, 0)
         self.accuracy = 0
@@ -360,14 +525,15 @@ class Table(object):
         if self.page < other.page:
             return True
 
+    @property
+    def cells(self):
+        return _CellGrid(self)
+
     @property
     def data(self):
         """Returns two-dimensional list of strings in table.
         """
-        d = []
-        for row in self.cells:
-            d.append([cell.text.strip() for cell in row])
-        return d
+        return [[text.strip() for text in row] for row in self._cell_text.tolist()]
 
     @property
     def parsing_report(self):
@@ -383,12 +549,25 @@ class Table(object):
         }
         return report
 
+    def set_text(self, r, c, text):
+        """Appends text to a cell, like setting the text of
+        table.cells[r][c] but without creating a cell view.
+
+        Parameters
+        ----------
+        r : int
+            Row index.
+        c : int
+            Column index.
+        text : str
+
+        """
+        self._cell_text[r, c] = "".join([self._cell_text[r, c], text])
+
     def set_all_edges(self):
         """Sets all table edges to True.
         """
-        for row in self.cells:
-            for cell in row:
-                cell.left = cell.right = cell.top = cell.bottom = True
+        self._left[:] = self._right[:] = self._top[:] = self._bottom[:] = True
         return self
 
     def set_edges(self, vertical, horizontal, joint_tol=2):
@@ -404,168 +583,65 @@ class Table(object):
             List of detected horizontal lines.
 
         """
-        for v in vertical:
-            # find closest x coord
-            # iterate over y coords and find closest start and end points
-            i = [
-                i
-                for i, t in enumerate(self.cols)
-                if np.isclose(v[0], t[0], atol=joint_tol)
-            ]
-            j = [
-                j
-                for j, t in enumerate(self.rows)
-                if np.isclose(v[3], t[0], atol=joint_tol)
-            ]
-            k = [
-                k
-                for k, t in enumerate(self.rows)
-                if np.isclose(v[1], t[0], atol=joint_tol)
-            ]
-            if not j:
-                continue
-            J = j[0]
-            if i == [0]:  # only left edge
-                L = i[0]
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[J][L].left = True
-                        J += 1
-                else:
-                    K = len(self.rows)
-                    while J < K:
-                        self.cells[J][L].left = True
-                        J += 1
-            elif i == []:  # only right edge
-                L = len(self.cols) - 1
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[J][L].right = True
-                        J += 1
-                else:
-                    K = len(self.rows)
-                    while J < K:
-                        self.cells[J][L].right = True
-                        J += 1
+        cols = np.asarray(self.cols, dtype=float).reshape(-1, 2)[:, 0]
+        rows = np.asarray(self.rows, dtype=float).reshape(-1, 2)[:, 0]
+        vertical = np.asarray(vertical, dtype=float).reshape(-1, 4)
+        horizontal = np.asarray(horizontal, dtype=float).reshape(-1, 4)
+
+        # find closest x coord and closest start and end y coords
+        matches = _match_segments(
+            vertical[:, 0], vertical[:, 3], vertical[:, 1], cols, rows, joint_tol
+        )
+        for L, n, J, K in zip(*matches):
+            if n == 1 and L == 0:  # only left edge
+                self._left[J:K, L] = True
+            elif n == 0:  # only right edge
+                self._right[J:K, len(self.cols) - 1] = True
             else:  # both left and right edges
-                L = i[0]
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[J][L].left = True
-                        self.cells[J][L - 1].right = True
-                        J += 1
-                else:
-                    K = len(self.rows)
-                    while J < K:
-                        self.cells[J][L].left = True
-                        self.cells[J][L - 1].right = True
-                        J += 1
-
-        for h in horizontal:
-            # find closest y coord
-            # iterate over x coords and find closest start and end points
-            i = [
-                i
-                for i, t in enumerate(self.rows)
-                if np.isclose(h[1], t[0], atol=joint_tol)
-            ]
-            j = [
-                j
-                for j, t in enumerate(self.cols)
-                if np.isclose(h[0], t[0], atol=joint_tol)
-            ]
-            k = [
-                k
-                for k, t in enumerate(self.cols)
-                if np.isclose(h[2], t[0], atol=joint_tol)
-            ]
-            if not j:
-                continue
-            J = j[0]
-            if i == [0]:  # only top edge
-                L = i[0]
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[L][J].top = True
-                        J += 1
-                else:
-                    K = len(self.cols)
-                    while J < K:
-                        self.cells[L][J].top = True
-                        J += 1
-            elif i == []:  # only bottom edge
-                L = len(self.rows) - 1
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[L][J].bottom = True
-                        J += 1
-                else:
-                    K = len(self.cols)
-                    while J < K:
-                        self.cells[L][J].bottom = True
-                        J += 1
+                self._left[J:K, L] = True
+                self._right[J:K, L - 1] = True
+
+        # find closest y coord and closest start and end x coords
+        matches = _match_segments(
+            horizontal[:, 1], horizontal[:, 0], horizontal[:, 2], rows, cols, joint_tol
+        )
+        for L, n, J, K in zip(*matches):
+            if n == 1 and L == 0:  # only top edge
+                self._top[L, J:K] = True
+            elif n == 0:  # only bottom edge
+                self._bottom[len(self.rows) - 1, J:K] = True
             else:  # both top and bottom edges
-                L = i[0]
-                if k:
-                    K = k[0]
-                    while J < K:
-                        self.cells[L][J].top = True
-                        self.cells[L - 1][J].bottom = True
-                        J += 1
-                else:
-                    K = len(self.cols)
-                    while J < K:
-                        self.cells[L][J].top = True
-                        self.cells[L - 1][J].bottom = True
-                        J += 1
+                self._top[L, J:K] = True
+                self._bottom[L - 1, J:K] = True
 
         return self
 
     def set_border(self):
         """Sets table border edges to True.
         """
-        for r in range(len(self.rows)):
-            self.cells[r][0].left = True
-            self.cells[r][len(self.cols) - 1].right = True
-        for c in range(len(self.cols)):
-            self.cells[0][c].top = True
-            self.cells[len(self.rows) - 1][c].bottom = True
+        if len(self.rows):
+            self._left[:, 0] = True
+            self._right[:, -1] = True
+        if len(self.cols):
+            self._top[0, :] = True
+            self._bottom[-1, :] = True
         return self
 
     def set_span(self):
         """Sets a cell's hspan or vspan attribute to True depending
         on whether the cell spans horizontally or vertically.
         """
-        for row in self.cells:
-            for cell in row:
-                left = cell.left
-                right = cell.right
-                top = cell.top
-                bottom = cell.bottom
-                if cell.bound == 4:
-                    continue
-                elif cell.bound == 3:
-                    if not left and (right and top and bottom):
-                        cell.hspan = True
-                    elif not right and (left and top and bottom):
-                        cell.hspan = True
-                    elif not top and (left and right and bottom):
-                        cell.vspan = True
-                    elif not bottom and (left and right and top):
-                        cell.vspan = True
-                elif cell.bound == 2:
-                    if left and right and (not top and not bottom):
-                        cell.vspan = True
-                    elif top and bottom and (not left and not right):
-                        cell.hspan = True
-                elif cell.bound in [0, 1]:
-                    cell.vspan = True
-                    cell.hspan = True
+        left, right, top, bottom = self._left, self._right, self._top, self._bottom
+        bound = np.sum([left, right, top, bottom], axis=0)
+        # bounded on three sides
+        self._hspan |= (bound == 3) & ((~left & right) | (~right & left)) & top & bottom
+        self._vspan |= (bound == 3) & ((~top & bottom) | (~bottom & top)) & left & right
+        # bounded on two opposite sides
+        self._vspan |= (bound == 2) & left & right
+        self._hspan |= (bound == 2) & top & bottom
+        # bounded on one side or not bounded at all
+        self._hspan |= bound <= 1
+        self._vspan |= bound <= 1
         return self
 
     def to_csv(self, path, **kwargs):
@@ -1,11 +1,21 @@
 # -*- coding: utf-8 -*-
 
+import io
 import os
 import sys
+import mmap
+import shutil
+import logging
+import tempfile
+import warnings
+import multiprocessing
 
 from PyPDF2 import PdfFileReader, PdfFileWriter
+from PyPDF2.pdf import PageObject
+from PyPDF2.generic import NameObject, IndirectObject
 
 from .core import TableList
+from .cache import PageCache, MemoryCache, file_hash
 from .parsers import Stream, Lattice
 from .utils import (
     TemporaryDirectory,
@@ -14,9 +24,176 @@ from .utils import (
     get_rotation,
     is_url,
     download_url,
+    PY3,
 )
 
 
+logger = logging.getLogger("camelot")
+
+# number of pages rendered by each Ghostscript run when batch_render
+# is True, which bounds the disk space used by page images
+BATCH_RENDER_PAGES = 50
+# number of pages split ahead for each worker process when parallel is
+# True, which bounds the memory used by single page PDFs
+PARALLEL_PAGES_PER_WORKER = 4
+# page attributes that a page inherits from its ancestors in the page
+# tree, see section 7.7.3.4 of the PDF 1.7 reference
+INHERITABLE_PAGE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+class _RecordingHandler(logging.Handler):
+    """Collects log records so that they can be sent from a worker
+    process back to the parent process.
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+def _record(func, *args, **kwargs):
+    """Calls a function inside a worker process, recording the
+    warnings and logs it emits so that they can be replayed in the
+    parent process.
+
+    Returns
+    -------
+    result : object
+        Return value of the function.
+    caught : list
+        List of tuples (message, category, filename, lineno) for each
+        warning raised by the function.
+    records : list
+        List of logging.LogRecord objects emitted by the function.
+
+    """
+    handler = _RecordingHandler()
+    handlers, propagate = logger.handlers, logger.propagate
+    logger.handlers, logger.propagate = [handler], False
+    try:
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            result = func(*args, **kwargs)
+    finally:
+        logger.handlers, logger.propagate = handlers, propagate
+    caught = [(str(m.message), m.category, m.filename, m.lineno) for m in w]
+    return result, caught, handler.records
+
+
+def _get_page_rotation(filename):
+    """Lays out a single page PDF with the default layout kwargs and
+    checks whether its text is rotated.
+
+    Returns
+    -------
+    rotation : str
+        '' if the text is horizontal, 'clockwise' or 'anticlockwise'.
+    layout : object
+        PDFMiner LTPage object.
+
+    """
+    layout, dim = get_page_layout(filename)
+    chars = get_text_objects(layout, ltype="char")
+    horizontal_text = get_text_objects(layout, ltype="horizontal_text")
+    vertical_text = get_text_objects(layout, ltype="vertical_text")
+    return get_rotation(chars, horizontal_text, vertical_text), layout
+
+
+def _rotate_page(p, rotation):
+    """Rotates a PyPDF2 page so that rotated text becomes horizontal."""
+    if rotation == "anticlockwise":
+        p.rotateClockwise(90)
+    elif rotation == "clockwise":
+        p.rotateCounterClockwise(90)
+
+
+def _parse_page(parser, filename, suppress_stdout, layout_kwargs, cache=None):
+    """Checks whether the text of a single page PDF is rotated, rotates
+    the page if it is, and extracts tables from it. The layout computed
+    by the rotation check is reused by the parser when the page isn't
+    rotated.
+
+    Parameters
+    ----------
+    parser : camelot.parsers.Lattice or camelot.parsers.Stream
+    filename : str or io.BytesIO
+        Path of the single page PDF, which is overwritten if the page
+        is rotated, or a buffer containing it.
+    suppress_stdout : bool
+        Suppress logs and warnings.
+    layout_kwargs : dict
+        A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+    cache : camelot.cache.PageCache, optional (default: None)
+        Cache for the page, from which its rotation is read instead
+        of being computed.
+
+    Returns
+    -------
+    tables : list
+        List of tables found on the page.
+
+    """
+    layout = None
+    rotation = None if cache is None else cache.get("rotation")
+    if rotation is None:
+        rotation, layout = _get_page_rotation(filename)
+        if cache is not None:
+            cache.put(rotation, "rotation")
+    if rotation != "":
+        if hasattr(filename, "read"):
+            filename.seek(0)
+            p = PdfFileReader(filename, strict=False).getPage(0)
+            _rotate_page(p, rotation)
+            filename = PDFHandler._write_page(p, filename.name)
+        else:
+            with open(filename, "rb") as f:
+                p = PdfFileReader(f, strict=False).getPage(0)
+                _rotate_page(p, rotation)
+                # the page reads its contents from the file, which can
+                # only be overwritten once it is written out
+                rotated = PDFHandler._write_page(p, os.path.basename(filename))
+            with open(filename, "wb") as f:
+                f.write(rotated.getvalue())
+        layout = None
+    return parser.extract_tables(
+        filename,
+        suppress_stdout=suppress_stdout,
+        layout_kwargs=layout_kwargs,
+        layout=None if layout_kwargs else layout,
+        cache=cache,
+    )
+
+
+def _parse_page_in_process(args):
+    """Parses a single page PDF inside a worker process, recording
+    warnings and logs to replay them in the parent process.
+
+    Parameters
+    ----------
+    args : tuple
+        Tuple (parser, filename, suppress_stdout, layout_kwargs, cache),
+        see camelot.handlers._parse_page.
+
+    Returns
+    -------
+    tables : list
+        List of tables found on the page.
+    caught : list
+        List of tuples (message, category, filename, lineno) for each
+        warning raised while parsing the page.
+    records : list
+        List of logging.LogRecord objects emitted while parsing the page.
+
+    """
+    return _record(_parse_page, *args)
+
+
 class PDFHandler(object):
     """Handles all operations like temp directory creation, splitting
     file into single page PDFs, parsing each PDF and then removing the
@@ -24,119 +201,318 @@ class PDFHandler(object):
 
     Parameters
     ----------
-    filepath : str
-        Filepath or URL of the PDF file.
+    filepath : str, bytes or file-like object
+        Filepath or URL of the PDF file, its contents as bytes (on
+        Python 3), bytearray or memoryview, or a binary file-like object like an
+        open file, io.BytesIO or mmap.mmap.
     pages : str, optional (default: '1')
         Comma-separated page numbers.
         Example: '1,3,4' or '1,4-end' or 'all'.
     password : str, optional (default: None)
         Password for decryption.
+    use_mmap : bool, optional (default: False)
+        Memory-map the PDF file instead of reading it with file
+        reads, when it is given as a path.
+
+    A PDF downloaded from a URL is removed once tables are extracted
+    from it. File-like objects are read from their start and are not
+    closed.
 
     """
 
-    def __init__(self, filepath, pages="1", password=None):
-        if is_url(filepath):
-            filepath = download_url(filepath)
+    def __init__(self, filepath, pages="1", password=None, use_mmap=False):
+        self._downloaded = None
+        if isinstance(filepath, (bytearray, memoryview)) or (
+            PY3 and isinstance(filepath, bytes)
+        ):
+            # bytes are str on Python 2, where they are taken as a path
+            filepath = io.BytesIO(filepath)
+        elif hasattr(filepath, "read"):
+            if not getattr(filepath, "seekable", lambda: True)():
+                filepath = io.BytesIO(filepath.read())
+        elif is_url(filepath):
+            filepath = self._downloaded = download_url(filepath)
         self.filepath = filepath
-        if not filepath.lower().endswith(".pdf"):
-            raise NotImplementedError("File format not supported")
+        self.use_mmap = use_mmap
+        self._fileobj = None
+        self._mmap = None
+        self._infile = None
+        self._found_pages = []
+        self._page_walk = None
+        try:
+            if not self._is_fileobj() and not filepath.lower().endswith(".pdf"):
+                raise NotImplementedError("File format not supported")
 
-        if password is None:
-            self.password = ""
-        else:
-            self.password = password
-            if sys.version_info[0] < 3:
-                self.password = self.password.encode("ascii")
-        self.pages = self._get_pages(self.filepath, pages)
+            if password is None:
+                self.password = ""
+            else:
+                self.password = password
+                if sys.version_info[0] < 3:
+                    self.password = self.password.encode("ascii")
+            self._page_ranges = self._get_pages(pages)
+        except BaseException:
+            self._remove_download()
+            raise
+
+    def _get_infile(self):
+        """Returns a PdfFileReader for the PDF file. The reader is
+        built and decrypted only once, and then shared by all page
+        operations until the handler is closed.
+
+        Returns
+        -------
+        infile : PyPDF2.PdfFileReader
+
+        """
+        if self._infile is None:
+            if self._is_fileobj():
+                self.filepath.seek(0)
+                fileobj = self.filepath
+            else:
+                fileobj = self._fileobj = open(self.filepath, "rb")
+                if self.use_mmap:
+                    # the reader seeks and reads a few bytes at a time,
+                    # which are memory accesses instead of syscalls on
+                    # a mapping
+                    fileobj = self._mmap = mmap.mmap(
+                        self._fileobj.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            self._infile = PdfFileReader(fileobj, strict=False)
+            if self._infile.isEncrypted:
+                self._infile.decrypt(self.password)
+        return self._infile
+
+    def _is_fileobj(self):
+        return hasattr(self.filepath, "read")
+
+    def close(self):
+        """Closes the PDF file opened by the shared reader. File-like
+        objects passed to the handler are left open.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._fileobj is not None:
+            self._fileobj.close()
+        self._fileobj = None
+        self._mmap = None
+        self._infile = None
+        self._found_pages = []
+        self._page_walk = None
+
+    def _remove_download(self):
+        """Closes and removes the PDF file if it was downloaded from
+        a URL.
+        """
+        self.close()
+        if self._downloaded is not None and os.path.exists(self._downloaded):
+            os.remove(self._downloaded)
+        self._downloaded = None
 
-    def _get_pages(self, filepath, pages):
-        """Converts pages string to list of ints.
+    def _get_pages(self, pages):
+        """Converts pages string to list of page ranges. The PDF file
+        is not read, the last page of open-ended ranges like '4-end' is
+        only resolved once pages are iterated.
 
         Parameters
         ----------
-        filepath : str
-            Filepath or URL of the PDF file.
         pages : str, optional (default: '1')
             Comma-separated page numbers.
             Example: '1,3,4' or '1,4-end' or 'all'.
 
         Returns
         -------
-        P : list
-            List of int page numbers.
+        page_ranges : list
+            Sorted list of (start, end) tuples of int page numbers,
+            where end is None for ranges that end on the last page.
 
         """
-        page_numbers = []
-        if pages == "1":
-            page_numbers.append({"start": 1, "end": 1})
+        page_ranges = []
+        if pages == "all":
+            page_ranges.append((1, None))
         else:
-            infile = PdfFileReader(open(filepath, "rb"), strict=False)
-            if infile.isEncrypted:
-                infile.decrypt(self.password)
-            if pages == "all":
-                page_numbers.append({"start": 1, "end": infile.getNumPages()})
-            else:
-                for r in pages.split(","):
-                    if "-" in r:
-                        a, b = r.split("-")
-                        if b == "end":
-                            b = infile.getNumPages()
-                        page_numbers.append({"start": int(a), "end": int(b)})
-                    else:
-                        page_numbers.append({"start": int(r), "end": int(r)})
-        P = []
-        for p in page_numbers:
-            P.extend(range(p["start"], p["end"] + 1))
-        return sorted(set(P))
+            for r in pages.split(","):
+                if "-" in r:
+                    a, b = r.split("-")
+                    page_ranges.append((int(a), None if b == "end" else int(b)))
+                else:
+                    page_ranges.append((int(r), int(r)))
+        return sorted(page_ranges, key=lambda r: r[0])
+
+    def _iter_page_numbers(self):
+        """Yields the page numbers to parse in increasing order. Pages
+        of open-ended ranges are looked up in the page tree as they
+        are reached, so that pages past the last one yielded are never
+        read.
+        """
+        last = 0
+        for start, end in self._page_ranges:
+            p = max(start, last + 1)
+            while (p <= end) if end is not None else self._has_page(p):
+                yield p
+                p += 1
+            last = max(last, p - 1)
+
+    @property
+    def pages(self):
+        """List of int page numbers to parse."""
+        return list(self._iter_page_numbers())
+
+    def _has_page(self, page):
+        """Returns whether the PDF has a page. The page is looked up
+        in the page tree, since the /Count entries of the tree can be
+        wrong.
+        """
+        infile = self._get_infile()
+        if infile.flattenedPages is None:
+            try:
+                self._find_page(infile, page)
+                return True
+            except IndexError:
+                return False
+            except Exception:
+                # malformed page trees are left to PyPDF2
+                pass
+        return page <= infile.getNumPages()
+
+    def _get_page(self, page):
+        """Returns a page of the PDF. The page tree is walked in order
+        like PdfFileReader.getPage does, but only up to the page, so
+        that the pages after it are never read.
+
+        Parameters
+        ----------
+        page : int
+            Page number.
 
-    def _save_page(self, filepath, page, temp):
-        """Saves specified page from PDF into a temporary directory.
+        Returns
+        -------
+        p : PyPDF2.pdf.PageObject
+
+        """
+        infile = self._get_infile()
+        if infile.flattenedPages is None:
+            try:
+                return self._find_page(infile, page)
+            except Exception:
+                # malformed page trees are left to PyPDF2
+                pass
+        return infile.getPage(page - 1)
+
+    def _find_page(self, infile, page):
+        if page < 1:
+            raise IndexError("list index out of range")
+        if self._found_pages is None:
+            raise ValueError("Invalid page tree")
+        if self._page_walk is None:
+            root = infile.trailer["/Root"].getObject()["/Pages"]
+            self._page_walk = self._walk_page_tree(infile, root, {}, frozenset())
+        while len(self._found_pages) < page:
+            try:
+                self._found_pages.append(next(self._page_walk))
+            except StopIteration:
+                raise IndexError("list index out of range")
+            except Exception:
+                self._found_pages = None
+                raise
+        return self._found_pages[page - 1]
+
+    def _walk_page_tree(self, infile, ref, inherit, ancestors):
+        """Yields the pages below a node of the page tree in order.
+        /Count entries are not used, since they can be wrong.
+        """
+        node = ref.getObject()
+        t = node.get("/Type", "/Pages")
+        if t == "/Pages":
+            if id(node) in ancestors:
+                raise ValueError("Cycle in page tree")
+            ancestors = ancestors | set([id(node)])
+            inherit = dict(inherit)
+            for attr in INHERITABLE_PAGE_ATTRIBUTES:
+                if attr in node:
+                    inherit[attr] = node[attr]
+            for kid in node["/Kids"]:
+                for p in self._walk_page_tree(infile, kid, inherit, ancestors):
+                    yield p
+        elif t == "/Page":
+            for attr, value in inherit.items():
+                if attr not in node:
+                    node[NameObject(attr)] = value
+            p = PageObject(infile, ref if isinstance(ref, IndirectObject) else None)
+            p.update(node)
+            yield p
+
+    def _save_page(self, page, temp=None, cache=None):
+        """Saves specified page from PDF into a temporary directory,
+        or into an in-memory buffer if no directory is given.
 
         Parameters
         ----------
-        filepath : str
-            Filepath or URL of the PDF file.
         page : int
             Page number.
-        temp : str
+        temp : str, optional (default: None)
             Tmp directory.
+        cache : camelot.cache.PageCache, optional (default: None)
+            Cache for the page, from which its rotation is read instead
+            of being computed.
+
+        Returns
+        -------
+        fpath : str or io.BytesIO
+            Path of the single page PDF, or a buffer containing it
+            whose name attribute is set to 'page-N.pdf'.
+        layout : object
+            PDFMiner LTPage object computed with the default layout
+            kwargs while checking for rotation, or None if the page
+            was rotated and has to be laid out again, or if its
+            rotation was read from the cache.
+        rotated : bool
+            Whether the page was rotated.
 
         """
-        with open(filepath, "rb") as fileobj:
-            infile = PdfFileReader(fileobj, strict=False)
-            if infile.isEncrypted:
-                infile.decrypt(self.password)
-            fpath = os.path.join(temp, "page-{0}.pdf".format(page))
-            froot, fext = os.path.splitext(fpath)
-            p = infile.getPage(page - 1)
-            outfile = PdfFileWriter()
-            outfile.addPage(p)
+        fname = "page-{0}.pdf".format(page)
+        p = self._get_page(page)
+        fpath, layout = None, None
+        rotation = None if cache is None else cache.get("rotation")
+        if rotation is None:
+            fpath = self._write_page(p, fname, temp)
+            rotation, layout = _get_page_rotation(fpath)
+            if cache is not None:
+                cache.put(rotation, "rotation")
+        # fix rotated PDF
+        if rotation != "":
+            _rotate_page(p, rotation)
+            fpath = self._write_page(p, fname, temp)
+            layout = None
+        elif fpath is None:
+            fpath = self._write_page(p, fname, temp)
+        return fpath, layout, rotation != ""
+
+    @staticmethod
+    def _write_page(p, fname, temp=None):
+        outfile = PdfFileWriter()
+        outfile.addPage(p)
+        if temp is None:
+            fpath = io.BytesIO()
+            fpath.name = fname
+            outfile.write(fpath)
+            fpath.seek(0)
+        else:
+            fpath = os.path.join(temp, fname)
             with open(fpath, "wb") as f:
                 outfile.write(f)
-            layout, dim = get_page_layout(fpath)
-            # fix rotated PDF
-            chars = get_text_objects(layout, ltype="char")
-            horizontal_text = get_text_objects(layout, ltype="horizontal_text")
-            vertical_text = get_text_objects(layout, ltype="vertical_text")
-            rotation = get_rotation(chars, horizontal_text, vertical_text)
-            if rotation != "":
-                fpath_new = "".join([froot.replace("page", "p"), "_rotated", fext])
-                os.rename(fpath, fpath_new)
-                infile = PdfFileReader(open(fpath_new, "rb"), strict=False)
-                if infile.isEncrypted:
-                    infile.decrypt(self.password)
-                outfile = PdfFileWriter()
-                p = infile.getPage(0)
-                if rotation == "anticlockwise":
-                    p.rotateClockwise(90)
-                elif rotation == "clockwise":
-                    p.rotateCounterClockwise(90)
-                outfile.addPage(p)
-                with open(fpath, "wb") as f:
-                    outfile.write(f)
+        return fpath
 
     def parse(
-        self, flavor="lattice", suppress_stdout=False, layout_kwargs={}, **kwargs
+        self,
+        flavor="lattice",
+        suppress_stdout=False,
+        layout_kwargs={},
+        parallel=False,
+        workers=None,
+        in_memory=False,
+        batch_render=False,
+        cache=None,
+        **kwargs
     ):
         """Extracts tables by calling parser.get_tables on all single
         page PDFs.
@@ -150,6 +526,22 @@ class PDFHandler(object):
             Suppress logs and warnings.
         layout_kwargs : dict, optional (default: {})
             A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+        parallel : bool, optional (default: False)
+            Parse pages in parallel using a pool of worker processes.
+        workers : int, optional (default: None)
+            Number of worker processes used when parallel is True.
+            Defaults to the number of CPUs.
+        in_memory : bool, optional (default: False)
+            Keep single page PDFs in memory instead of writing them to
+            a temp directory.
+        batch_render : bool, optional (default: False)
+            Render pages for lattice using one Ghostscript run for each
+            range of consecutive pages, instead of one run per page.
+            Rotated pages are still rendered one at a time. It is
+            ignored when parallel is True or resolution is 'auto'.
+        cache : str or camelot.cache.PageCache, optional (default: None)
+            Directory in which the layout of each page, and the image
+            it is rendered to for lattice, are cached across runs.
         kwargs : dict
             See camelot.read_pdf kwargs.
 
@@ -159,17 +551,342 @@ class PDFHandler(object):
             List of tables found in PDF.
 
         """
-        tables = []
-        with TemporaryDirectory() as tempdir:
-            for p in self.pages:
-                self._save_page(self.filepath, p, tempdir)
-            pages = [
-                os.path.join(tempdir, "page-{0}.pdf".format(p)) for p in self.pages
-            ]
+        tables = self.iter_parse(
+            flavor=flavor,
+            suppress_stdout=suppress_stdout,
+            layout_kwargs=layout_kwargs,
+            parallel=parallel,
+            workers=workers,
+            in_memory=in_memory,
+            batch_render=batch_render,
+            cache=cache,
+            **kwargs
+        )
+        return TableList(sorted(tables))
+
+    def iter_parse(
+        self,
+        flavor="lattice",
+        suppress_stdout=False,
+        layout_kwargs={},
+        parallel=False,
+        workers=None,
+        in_memory=False,
+        batch_render=False,
+        cache=None,
+        **kwargs
+    ):
+        """Extracts tables page by page, yielding the tables found on
+        each page as soon as it is parsed. Single page PDFs are removed
+        from the temp directory once they are parsed.
+
+        Parameters are the same as for PDFHandler.parse.
+
+        Yields
+        ------
+        table : camelot.core.Table
+            Tables in the order of their page and their order on the
+            page.
+
+        """
+        try:
             parser = Lattice(**kwargs) if flavor == "lattice" else Stream(**kwargs)
-            for p in pages:
-                t = parser.extract_tables(
-                    p, suppress_stdout=suppress_stdout, layout_kwargs=layout_kwargs
+            if cache is not None and not isinstance(cache, PageCache):
+                cache = PageCache(cache)
+            if in_memory:
+                pages = self._iter_pages(
+                    parser,
+                    parallel=parallel,
+                    workers=workers,
+                    batch_render=batch_render,
+                    cache=cache,
+                    suppress_stdout=suppress_stdout,
+                    layout_kwargs=layout_kwargs,
                 )
-                tables.extend(t)
-        return TableList(sorted(tables))
+                for tables in pages:
+                    for table in tables:
+                        yield table
+            else:
+                with TemporaryDirectory() as tempdir:
+                    pages = self._iter_pages(
+                        parser,
+                        temp=tempdir,
+                        parallel=parallel,
+                        workers=workers,
+                        batch_render=batch_render,
+                        cache=cache,
+                        suppress_stdout=suppress_stdout,
+                        layout_kwargs=layout_kwargs,
+                    )
+                    for tables in pages:
+                        for table in tables:
+                            yield table
+        finally:
+            self._remove_download()
+
+    def sweep(
+        self,
+        configs,
+        flavor="lattice",
+        suppress_stdout=False,
+        layout_kwargs={},
+        cache=None,
+    ):
+        """Extracts tables from all single page PDFs once for each
+        parser configuration. Each page is split, laid out and, for
+        lattice, rendered and thresholded only once, and then shared by
+        the parsers of all configurations.
+
+        Parameters
+        ----------
+        configs : list
+            List of dicts of parser kwargs, see camelot.read_pdf kwargs.
+        flavor : str (default: 'lattice')
+            The parsing method to use ('lattice' or 'stream').
+            Lattice is used by default.
+        suppress_stdout : str (default: False)
+            Suppress logs and warnings.
+        layout_kwargs : dict, optional (default: {})
+            A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+        cache : str or camelot.cache.PageCache, optional (default: None)
+            Directory in which the layout of each page, and the image
+            it is rendered to for lattice, are cached across runs. Page
+            data is only kept in memory while the page is parsed if no
+            cache is given.
+
+        Returns
+        -------
+        tables : list
+            List of camelot.core.TableList objects, one for each
+            configuration.
+
+        """
+        parser_class = Lattice if flavor == "lattice" else Stream
+        try:
+            parsers = [parser_class(**config) for config in configs]
+            if cache is not None:
+                if not isinstance(cache, PageCache):
+                    cache = PageCache(cache)
+                filehash = file_hash(self.filepath)
+
+            tables = [[] for parser in parsers]
+            with TemporaryDirectory() as tempdir:
+                for p in self.pages:
+                    if cache is None:
+                        page_cache = MemoryCache()
+                    else:
+                        page_cache = cache.for_page(filehash, p)
+                    with warnings.catch_warnings():
+                        if suppress_stdout:
+                            warnings.simplefilter("ignore")
+                        page, layout, __ = self._save_page(p, tempdir, cache=page_cache)
+                        for parser, parser_tables in zip(parsers, tables):
+                            parser_tables.extend(
+                                parser.extract_tables(
+                                    page,
+                                    suppress_stdout=suppress_stdout,
+                                    layout_kwargs=layout_kwargs,
+                                    layout=None if layout_kwargs else layout,
+                                    cache=page_cache,
+                                )
+                            )
+                    self._remove_page(page, tempdir)
+        finally:
+            self._remove_download()
+        return [TableList(sorted(parser_tables)) for parser_tables in tables]
+
+    @staticmethod
+    def _skip_batch_render(parser, page_cache):
+        """Returns whether a page doesn't have to be batch rendered,
+        because its image is cached or because it is rotated and is
+        rendered on its own.
+        """
+        if page_cache.get("rotation") not in (None, ""):
+            return True
+        return page_cache.has("image", *parser._image_key())
+
+    @staticmethod
+    def _remove_page(page, temp=None):
+        """Removes a single page PDF and the files made from it by the
+        parser from the temp directory.
+        """
+        if temp is None:
+            return
+        rootname, __ = os.path.splitext(page)
+        for ext in [".pdf", ".pgm"]:
+            if os.path.exists(rootname + ext):
+                os.remove(rootname + ext)
+
+    def _iter_pages(
+        self,
+        parser,
+        temp=None,
+        parallel=False,
+        workers=None,
+        batch_render=False,
+        cache=None,
+        suppress_stdout=False,
+        layout_kwargs={},
+    ):
+        """Splits the PDF into single page PDFs and extracts tables
+        from them, yielding a list of tables for each page in page
+        order. Pages are kept in memory if no temp directory is given.
+        """
+        rendered = None
+        # ghostscript can only render the whole PDF from a path
+        if (
+            batch_render
+            and isinstance(parser, Lattice)
+            and parser.line_source == "raster"
+            and not self._is_fileobj()
+        ):
+            rendered = tempfile.mkdtemp()
+        if cache is not None:
+            filehash = file_hash(self.filepath)
+        try:
+            if parallel and len(self.pages) > 1:
+                pages = self._iter_parallel(
+                    parser,
+                    temp=temp,
+                    workers=workers,
+                    cache=cache,
+                    suppress_stdout=suppress_stdout,
+                    layout_kwargs=layout_kwargs,
+                )
+                for tables in pages:
+                    yield tables
+            else:
+                images = {}
+                if rendered is not None:
+                    page_numbers = self.pages
+                else:
+                    # pages are resolved as they are parsed, so that
+                    # parsing stops reading the PDF when iteration stops
+                    page_numbers = self._iter_page_numbers()
+                for i, p in enumerate(page_numbers):
+                    if rendered is not None and i % BATCH_RENDER_PAGES == 0:
+                        for imagename in images.values():
+                            if os.path.exists(imagename):
+                                os.remove(imagename)
+                        batch = page_numbers[i : i + BATCH_RENDER_PAGES]
+                        if cache is not None:
+                            batch = [
+                                q
+                                for q in batch
+                                if not self._skip_batch_render(
+                                    parser, cache.for_page(filehash, q)
+                                )
+                            ]
+                        images = {}
+                        if batch:
+                            images = parser.render_pages(
+                                self.filepath, batch, rendered, password=self.password
+                            )
+                    page_cache = None
+                    if cache is not None:
+                        page_cache = cache.for_page(filehash, p)
+                    with warnings.catch_warnings():
+                        if suppress_stdout:
+                            warnings.simplefilter("ignore")
+                        page, layout, rotated = self._save_page(
+                            p, temp, cache=page_cache
+                        )
+                        render_kwargs = {}
+                        # rotated pages are rendered again from the
+                        # rotated pdf
+                        if p in images and not rotated:
+                            render_kwargs["imagename"] = images[p]
+                        # reuse the layout from the rotation check only if
+                        # it was computed with the same layout kwargs
+                        tables = parser.extract_tables(
+                            page,
+                            suppress_stdout=suppress_stdout,
+                            layout_kwargs=layout_kwargs,
+                            layout=None if layout_kwargs else layout,
+                            cache=page_cache,
+                            **render_kwargs
+                        )
+                    self._remove_page(page, temp)
+                    yield tables
+        finally:
+            self.close()
+            if rendered is not None:
+                shutil.rmtree(rendered)
+
+    def _iter_parallel(
+        self,
+        parser,
+        temp=None,
+        workers=None,
+        cache=None,
+        suppress_stdout=False,
+        layout_kwargs={},
+    ):
+        """Extracts tables from single page PDFs using a pool of
+        worker processes, yielding a list of tables for each page in
+        page order. Warnings and logs emitted by the workers are
+        replayed in the parent process in page order.
+
+        Pages are split and sent to the workers in chunks, so that
+        only a few single page PDFs are kept at a time.
+
+        Parameters
+        ----------
+        parser : camelot.parsers.Lattice or camelot.parsers.Stream
+        temp : str, optional (default: None)
+            Tmp directory.
+        workers : int, optional (default: None)
+            Number of worker processes. Defaults to the number of CPUs.
+        cache : camelot.cache.PageCache, optional (default: None)
+            Cache of page rotations, layouts and images.
+        suppress_stdout : bool, optional (default: False)
+            Suppress logs and warnings.
+        layout_kwargs : dict, optional (default: {})
+            A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+
+        Yields
+        ------
+        tables : list
+            List of tables found on a page.
+
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        page_numbers = self.pages
+        workers = min(workers, len(page_numbers))
+        chunksize = workers * PARALLEL_PAGES_PER_WORKER
+
+        if cache is not None:
+            filehash = file_hash(self.filepath)
+
+        pool = multiprocessing.Pool(processes=workers)
+        try:
+            for i in range(0, len(page_numbers), chunksize):
+                page_caches = [
+                    None if cache is None else cache.for_page(filehash, p)
+                    for p in page_numbers[i : i + chunksize]
+                ]
+                # pages are only split here, and checked for rotation
+                # and laid out by the workers
+                pages = [
+                    self._write_page(self._get_page(p), "page-{}.pdf".format(p), temp)
+                    for p in page_numbers[i : i + chunksize]
+                ]
+                tasks = [
+                    (parser, p, suppress_stdout, layout_kwargs, page_cache)
+                    for p, page_cache in zip(pages, page_caches)
+                ]
+                results = pool.imap(_parse_page_in_process, tasks)
+                for page, (tables, caught, records) in zip(pages, results):
+                    for record in records:
+                        logger.handle(record)
+                    with warnings.catch_warnings():
+                        if suppress_stdout:
+                            warnings.simplefilter("ignore")
+                        for message, category, filename, lineno in caught:
+                            warnings.warn_explicit(message, category, filename, lineno)
+                    self._remove_page(page, temp)
+                    yield tables
+        finally:
+            pool.terminate()
+            pool.join()
@@ -6,13 +6,49 @@ import cv2
 import numpy as np
 
 
-def adaptive_threshold(imagename, process_background=False, blocksize=15, c=-2):
-    """Thresholds an image using OpenCV's adaptiveThreshold.
+def read_grayscale(imagename):
+    """Reads an image file as an 8-bit grayscale image.
 
     Parameters
     ----------
     imagename : string
         Path to image file.
+
+    Returns
+    -------
+    img : object
+        Two-dimensional numpy.ndarray representing the image.
+
+    """
+    return cv2.imread(imagename, cv2.IMREAD_GRAYSCALE)
+
+
+def decode_grayscale(data):
+    """Decodes an image file held in memory as an 8-bit grayscale
+    image.
+
+    Parameters
+    ----------
+    data : bytes
+        Contents of the image file.
+
+    Returns
+    -------
+    img : object
+        Two-dimensional numpy.ndarray representing the image.
+
+    """
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+
+
+def adaptive_threshold(imagename, process_background=False, blocksize=15, c=-2):
+    """Thresholds an image using OpenCV's adaptiveThreshold.
+
+    Parameters
+    ----------
+    imagename : string or object
+        Path to image file, or a numpy.ndarray representing a
+        grayscale or BGR image.
     process_background : bool, optional (default: False)
         Whether or not to process lines that are in background.
     blocksize : int, optional (default: 15)
@@ -34,8 +70,14 @@ def adaptive_threshold(imagename, process_background=False, blocksize=15, c=-2):
         numpy.ndarray representing the thresholded image.
 
     """
-    img = cv2.imread(imagename)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    if isinstance(imagename, np.ndarray):
+        img = imagename
+    else:
+        img = cv2.imread(imagename)
+    if img.ndim == 2:
+        gray = img
+    else:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
     if process_background:
         threshold = cv2.adaptiveThreshold(
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import warnings
+import itertools
 
 from .handlers import PDFHandler
 from .utils import validate_input, remove_extra
@@ -13,6 +14,12 @@ def read_pdf(
     flavor="lattice",
     suppress_stdout=False,
     layout_kwargs={},
+    parallel=False,
+    workers=None,
+    in_memory=False,
+    batch_render=False,
+    cache=None,
+    use_mmap=False,
     **kwargs
 ):
     """Read PDF and return extracted tables.
@@ -22,8 +29,12 @@ def read_pdf(
 
     Parameters
     ----------
-    filepath : str
-        Filepath or URL of the PDF file.
+    filepath : str, bytes or file-like object
+        Filepath or URL of the PDF file, its contents as bytes (on
+        Python 3), bytearray or memoryview, or a seekable binary file-like object
+        like an open file, io.BytesIO or mmap.mmap. With in_memory=True,
+        a PDF that is not on disk is never written to disk, apart from
+        the pages that lattice renders to images.
     pages : str, optional (default: '1')
         Comma-separated page numbers.
         Example: '1,3,4' or '1,4-end' or 'all'.
@@ -36,6 +47,29 @@ def read_pdf(
         Print all logs and warnings.
     layout_kwargs : dict, optional (default: {})
         A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+    parallel : bool, optional (default: False)
+        Parse pages in parallel using a pool of worker processes.
+    workers : int, optional (default: None)
+        Number of worker processes used when parallel is True.
+        Defaults to the number of CPUs.
+    in_memory : bool, optional (default: False)
+        Keep single page PDFs in memory instead of writing them to
+        a temp directory. Lattice still writes a page to disk when
+        converting it to an image.
+    batch_render* : bool, optional (default: False)
+        Render pages using one Ghostscript run for each range of
+        consecutive pages, instead of one run per page. It is ignored
+        when parallel is True or resolution is 'auto'.
+    cache : str or camelot.cache.PageCache, optional (default: None)
+        Directory in which the layout of each page, and for lattice the
+        image it is rendered to, are cached across runs. Entries are
+        keyed by the contents of the PDF file, so that parsing it again
+        with other options reuses them. Pass a camelot.cache.PageCache
+        to limit the size of the cache to something other than 1 GiB.
+    use_mmap : bool, optional (default: False)
+        Memory-map the PDF file while it is split into pages, instead
+        of reading it with many small file reads. Useful for large
+        PDFs given as a path.
     table_areas : list, optional (default: None)
         List of table area strings of the form x1,y1,x2,y2
         where (x1, y1) -> left-top and (x2, y2) -> right-bottom
@@ -90,8 +124,24 @@ def read_pdf(
         Number of times for erosion/dilation is applied.
 
         For more information, refer `OpenCV's dilate <https://docs.opencv.org/2.4/modules/imgproc/doc/filtering.html#dilate>`_.
-    resolution* : int, optional (default: 300)
-        Resolution used for PDF to PNG conversion.
+    resolution* : int or str, optional (default: 300)
+        Resolution used for PDF to image conversion. If 'auto', the lowest
+        resolution at which the thinnest ruling line on the page is
+        still at least a pixel wide is used.
+    backend* : str or object, optional (default: 'ghostscript')
+        {'ghostscript', 'ghostscript_subprocess'}
+        Backend used for PDF to image conversion. 'ghostscript_subprocess'
+        runs the Ghostscript executable and can render pages from
+        several threads at once.
+    line_source* : str, optional (default: 'raster')
+        {'raster', 'vector'}
+        'vector' builds ruling lines from the lines and rectangles
+        drawn in the PDF instead of converting the page to an image.
+        Pages without any vector ruling lines fall back to 'raster'.
+    keep_debug_data : bool, optional (default: True)
+        Keep the data used by camelot.plot on each table. Set it to
+        False when tables won't be plotted, so that lattice tables
+        don't keep a copy of the page image.
 
     Returns
     -------
@@ -108,12 +158,199 @@ def read_pdf(
             warnings.simplefilter("ignore")
 
         validate_input(kwargs, flavor=flavor)
-        p = PDFHandler(filepath, pages=pages, password=password)
+        p = PDFHandler(filepath, pages=pages, password=password, use_mmap=use_mmap)
         kwargs = remove_extra(kwargs, flavor=flavor)
         tables = p.parse(
             flavor=flavor,
             suppress_stdout=suppress_stdout,
             layout_kwargs=layout_kwargs,
+            parallel=parallel,
+            workers=workers,
+            in_memory=in_memory,
+            batch_render=batch_render,
+            cache=cache,
             **kwargs
         )
         return tables
+
+
+def iter_pdf(
+    filepath,
+    pages="1",
+    password=None,
+    flavor="lattice",
+    suppress_stdout=False,
+    layout_kwargs={},
+    parallel=False,
+    workers=None,
+    in_memory=False,
+    batch_render=False,
+    cache=None,
+    use_mmap=False,
+    **kwargs
+):
+    """Read PDF and yield extracted tables page by page.
+
+    Tables are yielded as soon as the page they are on is parsed, in
+    the same order in which read_pdf returns them, so that they can be
+    consumed while the rest of the PDF is being parsed. Camelot only
+    keeps the tables and single page PDFs of the page being parsed,
+    or of a few pages per worker process when parallel is True.
+
+    Parameters
+    ----------
+    filepath : str, bytes or file-like object
+        Filepath or URL of the PDF file, or its contents, see
+        camelot.read_pdf.
+    pages : str, optional (default: '1')
+        Comma-separated page numbers.
+        Example: '1,3,4' or '1,4-end' or 'all'.
+    password : str, optional (default: None)
+        Password for decryption.
+    flavor : str (default: 'lattice')
+        The parsing method to use ('lattice' or 'stream').
+        Lattice is used by default.
+    suppress_stdout : bool, optional (default: True)
+        Print all logs and warnings.
+    layout_kwargs : dict, optional (default: {})
+        A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+    keep_debug_data : bool, optional (default: False)
+        Keep the data used by camelot.plot on each table. Unlike
+        read_pdf, it is off by default.
+    kwargs : dict
+        See camelot.read_pdf for the other parameters.
+
+    Returns
+    -------
+    tables : generator
+        Generator of camelot.core.Table objects.
+
+    """
+    if flavor not in ["lattice", "stream"]:
+        raise NotImplementedError(
+            "Unknown flavor specified." " Use either 'lattice' or 'stream'"
+        )
+
+    with warnings.catch_warnings():
+        if suppress_stdout:
+            warnings.simplefilter("ignore")
+
+        validate_input(kwargs, flavor=flavor)
+        p = PDFHandler(filepath, pages=pages, password=password, use_mmap=use_mmap)
+        kwargs = remove_extra(kwargs, flavor=flavor)
+        kwargs.setdefault("keep_debug_data", False)
+    return p.iter_parse(
+        flavor=flavor,
+        suppress_stdout=suppress_stdout,
+        layout_kwargs=layout_kwargs,
+        parallel=parallel,
+        workers=workers,
+        in_memory=in_memory,
+        batch_render=batch_render,
+        cache=cache,
+        **kwargs
+    )
+
+
+def sweep(
+    filepath,
+    pages="1",
+    password=None,
+    flavor="lattice",
+    param_grid={},
+    suppress_stdout=False,
+    layout_kwargs={},
+    cache=None,
+    use_mmap=False,
+    **kwargs
+):
+    """Read PDF once for each combination of parser kwargs in a grid
+    and return the extracted tables for each of them.
+
+    Each page is split, laid out and, for lattice, rendered and
+    thresholded only once, and then parsed with every combination, so
+    that parser kwargs can be tuned without parsing the PDF again.
+
+    Parameters
+    ----------
+    filepath : str, bytes or file-like object
+        Filepath or URL of the PDF file, or its contents, see
+        camelot.read_pdf.
+    pages : str, optional (default: '1')
+        Comma-separated page numbers.
+        Example: '1,3,4' or '1,4-end' or 'all'.
+    password : str, optional (default: None)
+        Password for decryption.
+    flavor : str (default: 'lattice')
+        The parsing method to use ('lattice' or 'stream').
+        Lattice is used by default.
+    param_grid : dict or list, optional (default: {})
+        Dict of parser kwargs to lists of values to try, or a list of
+        such dicts. Every combination of the values in a dict is tried.
+        Example: {'row_tol': [2, 10], 'edge_tol': [50, 500]}.
+    suppress_stdout : bool, optional (default: True)
+        Print all logs and warnings.
+    layout_kwargs : dict, optional (default: {})
+        A dict of `pdfminer.layout.LAParams <https://github.com/euske/pdfminer/blob/master/pdfminer/layout.py#L33>`_ kwargs.
+    cache : str or camelot.cache.PageCache, optional (default: None)
+        Directory in which page data is cached across runs, see
+        camelot.read_pdf.
+    use_mmap : bool, optional (default: False)
+        Memory-map the PDF file, see camelot.read_pdf.
+    keep_debug_data : bool, optional (default: False)
+        Keep the data used by camelot.plot on each table.
+    kwargs : dict
+        Parser kwargs shared by all combinations, see camelot.read_pdf.
+
+    Returns
+    -------
+    results : list
+        List with a dict for each combination, with the keys 'params'
+        for its kwargs, 'tables' for the camelot.core.TableList found
+        with them and 'parsing_report' for the list of parsing reports
+        of these tables.
+
+    """
+    if flavor not in ["lattice", "stream"]:
+        raise NotImplementedError(
+            "Unknown flavor specified." " Use either 'lattice' or 'stream'"
+        )
+
+    if isinstance(param_grid, dict):
+        param_grid = [param_grid]
+    params = []
+    for grid in param_grid:
+        keys = list(grid.keys())
+        for values in itertools.product(*[grid[key] for key in keys]):
+            params.append(dict(zip(keys, values)))
+
+    with warnings.catch_warnings():
+        if suppress_stdout:
+            warnings.simplefilter("ignore")
+
+        configs = []
+        for p in params:
+            config = dict(kwargs)
+            config.update(p)
+            validate_input(config, flavor=flavor)
+            config = remove_extra(config, flavor=flavor)
+            config.setdefault("keep_debug_data", False)
+            configs.append(config)
+        handler = PDFHandler(
+            filepath, pages=pages, password=password, use_mmap=use_mmap
+        )
+        tables = handler.sweep(
+            configs,
+            flavor=flavor,
+            suppress_stdout=suppress_stdout,
+            layout_kwargs=layout_kwargs,
+            cache=cache,
+        )
+    return [
+        {
+            "params": p,
+            "tables": t,
+            "parsing_report": [table.parsing_report for table in t],
+        }
+        for p, t in zip(params, tables)
+    ]
@@ -2,19 +2,45 @@
 
 import os
 
-from ..utils import get_page_layout, get_text_objects
+from ..utils import get_page_layout, get_text_objects, TextLineTable, TextIndex
 
 
 class BaseParser(object):
     """Defines a base parser.
     """
 
-    def _generate_layout(self, filename, layout_kwargs):
-        self.filename = filename
+    def _generate_layout(self, filename, layout_kwargs, layout=None, cache=None):
+        # filename can also be an in-memory single page PDF whose
+        # name attribute is set to 'page-N.pdf'
+        if hasattr(filename, "read"):
+            self.fileobj = filename
+            self.filename = filename.name
+        else:
+            self.fileobj = None
+            self.filename = filename
         self.layout_kwargs = layout_kwargs
-        self.layout, self.dimensions = get_page_layout(filename, **layout_kwargs)
+        self.cache = cache
+        cache_key = ("layout", sorted(layout_kwargs.items()))
+        cached = False
+        if layout is None and cache is not None:
+            layout = cache.get(*cache_key)
+            cached = layout is not None
+        if layout is None:
+            self.layout, self.dimensions = get_page_layout(filename, **layout_kwargs)
+        else:
+            # reuse a layout that was already computed for this page
+            self.layout = layout
+            self.dimensions = (layout.bbox[2], layout.bbox[3])
+        if cache is not None and not cached:
+            cache.put(self.layout, *cache_key)
         self.images = get_text_objects(self.layout, ltype="image")
         self.horizontal_text = get_text_objects(self.layout, ltype="horizontal_text")
         self.vertical_text = get_text_objects(self.layout, ltype="vertical_text")
+        # read coordinates and text of the text lines once, and answer
+        # all bbox queries on this page from an index
+        self.horizontal_lines = TextLineTable(self.horizontal_text)
+        self.vertical_lines = TextLineTable(self.vertical_text)
+        self.horizontal_text_index = TextIndex(self.horizontal_lines)
+        self.vertical_text_index = TextIndex(self.vertical_lines)
         self.pdf_width, self.pdf_height = self.dimensions
         self.rootname, __ = os.path.splitext(self.filename)
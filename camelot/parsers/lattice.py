@@ -4,6 +4,8 @@ from __future__ import division
 import os
 import sys
 import copy
+import shutil
+import tempfile
 import locale
 import logging
 import warnings
@@ -14,26 +16,38 @@ import pandas as pd
 
 from .base import BaseParser
 from ..core import Table
+from ..backends import get_backend
 from ..utils import (
     scale_image,
     scale_pdf,
-    segments_in_bbox,
-    text_in_bbox,
+    SegmentIndex,
     merge_close_lines,
+    CellIndex,
     get_table_index,
     compute_accuracy,
     compute_whitespace,
+    get_text_objects,
+    get_ruling_width,
+    string_types,
 )
 from ..image_processing import (
+    read_grayscale,
     adaptive_threshold,
     find_lines,
     find_contours,
     find_joints,
 )
+from .. import vector_processing
 
 
 logger = logging.getLogger("camelot")
 
+# resolutions tried in increasing order when resolution='auto'
+AUTO_RESOLUTIONS = (72, 150, 300)
+# minimum width in pixels that the thinnest ruling line should have
+# at the resolution picked when resolution='auto'
+AUTO_RESOLUTION_MIN_LINE_WIDTH = 1
+
 
 class Lattice(BaseParser):
     """Lattice method of parsing looks for lines between text
@@ -90,8 +104,29 @@ class Lattice(BaseParser):
         Number of times for erosion/dilation is applied.
 
         For more information, refer `OpenCV's dilate <https://docs.opencv.org/2.4/modules/imgproc/doc/filtering.html#dilate>`_.
-    resolution : int, optional (default: 300)
-        Resolution used for PDF to PNG conversion.
+    resolution : int or str, optional (default: 300)
+        Resolution used for PDF to image conversion. If 'auto', the lowest
+        resolution at which the thinnest ruling line on the page is
+        still at least a pixel wide is used.
+    backend : str or object, optional (default: 'ghostscript')
+        {'ghostscript', 'ghostscript_subprocess'}
+        Backend used for PDF to image conversion. 'ghostscript' uses
+        the Ghostscript C-API and renders one page at a time in a
+        process, while 'ghostscript_subprocess' runs the Ghostscript
+        executable and can render pages from several threads at once.
+        An object with a render method like
+        camelot.backends.GhostscriptBackend can also be passed.
+    line_source : str, optional (default: 'raster')
+        {'raster', 'vector'}
+        Where ruling lines are detected. 'raster' detects them on an
+        image of the page, while 'vector' builds them from the lines
+        and rectangles drawn in the PDF, without converting the page
+        to an image. Pages without any vector ruling lines, and
+        process_background, fall back to 'raster'.
+    keep_debug_data : bool, optional (default: True)
+        Keep the text, ruling lines, text edges and page image used by
+        camelot.plot on each table. Set it to False when tables won't
+        be plotted, so that they don't keep a copy of the page image.
 
     """
 
@@ -112,6 +147,9 @@ class Lattice(BaseParser):
         threshold_constant=-2,
         iterations=0,
         resolution=300,
+        backend="ghostscript",
+        line_source="raster",
+        keep_debug_data=True,
         **kwargs
     ):
         self.table_regions = table_regions
@@ -129,6 +167,11 @@ class Lattice(BaseParser):
         self.threshold_constant = threshold_constant
         self.iterations = iterations
         self.resolution = resolution
+        self.backend = backend
+        if line_source not in ["raster", "vector"]:
+            raise ValueError("line_source should be either 'raster' or 'vector'")
+        self.line_source = line_source
+        self.keep_debug_data = keep_debug_data
 
     @staticmethod
     def _reduce_index(t, idx, shift_text):
@@ -157,20 +200,20 @@ class Lattice(BaseParser):
         for r_idx, c_idx, text in idx:
             for d in shift_text:
                 if d == "l":
-                    if t.cells[r_idx][c_idx].hspan:
-                        while not t.cells[r_idx][c_idx].left:
+                    if t._hspan[r_idx, c_idx]:
+                        while not t._left[r_idx, c_idx]:
                             c_idx -= 1
                 if d == "r":
-                    if t.cells[r_idx][c_idx].hspan:
-                        while not t.cells[r_idx][c_idx].right:
+                    if t._hspan[r_idx, c_idx]:
+                        while not t._right[r_idx, c_idx]:
                             c_idx += 1
                 if d == "t":
-                    if t.cells[r_idx][c_idx].vspan:
-                        while not t.cells[r_idx][c_idx].top:
+                    if t._vspan[r_idx, c_idx]:
+                        while not t._top[r_idx, c_idx]:
                             r_idx -= 1
                 if d == "b":
-                    if t.cells[r_idx][c_idx].vspan:
-                        while not t.cells[r_idx][c_idx].bottom:
+                    if t._vspan[r_idx, c_idx]:
+                        while not t._bottom[r_idx, c_idx]:
                             r_idx += 1
             indices.append((r_idx, c_idx, text))
         return indices
@@ -193,33 +236,136 @@ class Lattice(BaseParser):
         t : camelot.core.Table
 
         """
+        text = t._cell_text
         for f in copy_text:
             if f == "h":
-                for i in range(len(t.cells)):
-                    for j in range(len(t.cells[i])):
-                        if t.cells[i][j].text.strip() == "":
-                            if t.cells[i][j].hspan and not t.cells[i][j].left:
-                                t.cells[i][j].text = t.cells[i][j - 1].text
+                # go column by column so that text is copied across
+                # all the columns a cell spans
+                for j in range(len(t.cols)):
+                    empty = np.array([s.strip() == "" for s in text[:, j]], dtype=bool)
+                    copy = empty & t._hspan[:, j] & ~t._left[:, j]
+                    text[copy, j] = text[copy, j] + text[copy, j - 1]
             elif f == "v":
-                for i in range(len(t.cells)):
-                    for j in range(len(t.cells[i])):
-                        if t.cells[i][j].text.strip() == "":
-                            if t.cells[i][j].vspan and not t.cells[i][j].top:
-                                t.cells[i][j].text = t.cells[i - 1][j].text
+                for i in range(len(t.rows)):
+                    empty = np.array([s.strip() == "" for s in text[i, :]], dtype=bool)
+                    copy = empty & t._vspan[i, :] & ~t._top[i, :]
+                    text[i, copy] = text[i, copy] + text[i - 1, copy]
         return t
 
-    def _generate_image(self):
-        from ..ext.ghostscript import Ghostscript
+    def _get_resolution(self):
+        """Returns the resolution used to convert the page to an image,
+        picking one based on the thinnest ruling line on the page if
+        resolution is 'auto'.
+        """
+        if self.resolution != "auto":
+            return self.resolution
+        curves = get_text_objects(self.layout, ltype="curve")
+        width = get_ruling_width(curves)
+        if width is None:
+            return AUTO_RESOLUTIONS[-1]
+        for resolution in AUTO_RESOLUTIONS:
+            if width * resolution / 72.0 >= AUTO_RESOLUTION_MIN_LINE_WIDTH:
+                return resolution
+        return AUTO_RESOLUTIONS[-1]
+
+    def render_pages(self, filepath, pages, outdir, password=None):
+        """Renders pages of a PDF file to grayscale images, using a
+        single Ghostscript run for each range of consecutive pages.
 
-        self.imagename = "".join([self.rootname, ".png"])
-        gs_call = "-q -sDEVICE=png16m -o {} -r300 {}".format(
-            self.imagename, self.filename
-        )
-        gs_call = gs_call.encode().split()
-        null = open(os.devnull, "wb")
-        with Ghostscript(*gs_call, stdout=null) as gs:
-            pass
-        null.close()
+        Parameters
+        ----------
+        filepath : str
+            Path of the PDF file.
+        pages : list
+            List of int page numbers.
+        outdir : str
+            Directory where the images are written.
+        password : str, optional (default: None)
+            Password for decryption.
+
+        Returns
+        -------
+        images : dict
+            Dict mapping page numbers to image paths. It is empty if
+            resolution is 'auto', since the resolution is then picked
+            separately for each page.
+
+        """
+        images = {}
+        if self.resolution == "auto":
+            return images
+
+        ranges = []
+        for page in sorted(pages):
+            if ranges and page == ranges[-1][1] + 1:
+                ranges[-1][1] = page
+            else:
+                ranges.append([page, page])
+
+        backend = get_backend(self.backend)
+        for first, last in ranges:
+            imagename = os.path.join(outdir, "page-{}-%d.pgm".format(first))
+            backend.render(
+                filepath,
+                imagename,
+                self.resolution,
+                first_page=first,
+                last_page=last,
+                password=password,
+            )
+            for page in range(first, last + 1):
+                images[page] = imagename % (page - first + 1)
+        return images
+
+    def _image_key(self):
+        """Returns the part of cache keys that identifies how the page
+        is rendered to an image.
+        """
+        backend = self.backend
+        if not isinstance(backend, string_types):
+            backend = type(backend).__name__
+        return (self._get_resolution(), backend)
+
+    def _generate_image(self):
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ("image",) + self._image_key()
+            self.image = self.cache.get(*cache_key)
+            if self.image is not None:
+                return
+
+        self._render_image()
+        if cache_key is not None:
+            self.cache.put(self.image, *cache_key)
+
+    def _render_image(self):
+        if self.imagename is not None:
+            # page was already rendered by render_pages
+            self.image = read_grayscale(self.imagename)
+            return
+
+        filename = self.filename
+        if self.fileobj is not None:
+            # ghostscript needs a path, write the in-memory page to a
+            # temp directory which is removed after thresholding
+            self._tempdir = tempfile.mkdtemp()
+            filename = os.path.join(self._tempdir, os.path.basename(self.filename))
+            self.fileobj.seek(0)
+            with open(filename, "wb") as f:
+                f.write(self.fileobj.read())
+            self.rootname, __ = os.path.splitext(filename)
+
+        # render an uncompressed 8-bit grayscale image, which is all
+        # that thresholding needs, to skip png encoding and decoding
+        backend = get_backend(self.backend)
+        if hasattr(backend, "render_array"):
+            # the image is piped from the backend instead of going
+            # through a file
+            self.image = backend.render_array(filename, self._get_resolution())
+            return
+        self.imagename = "".join([self.rootname, ".pgm"])
+        backend.render(filename, self.imagename, self._get_resolution())
+        self.image = read_grayscale(self.imagename)
 
     def _generate_table_bbox(self):
         def scale_areas(areas):
@@ -234,12 +380,24 @@ class Lattice(BaseParser):
                 scaled_areas.append((x1, y1, abs(x2 - x1), abs(y2 - y1)))
             return scaled_areas
 
-        self.image, self.threshold = adaptive_threshold(
-            self.imagename,
-            process_background=self.process_background,
-            blocksize=self.threshold_blocksize,
-            c=self.threshold_constant,
-        )
+        self.threshold = None
+        if self.cache is not None:
+            cache_key = ("threshold",) + self._image_key()
+            cache_key += (
+                self.process_background,
+                self.threshold_blocksize,
+                self.threshold_constant,
+            )
+            self.threshold = self.cache.get(*cache_key)
+        if self.threshold is None:
+            self.image, self.threshold = adaptive_threshold(
+                self.image,
+                process_background=self.process_background,
+                blocksize=self.threshold_blocksize,
+                c=self.threshold_constant,
+            )
+            if self.cache is not None:
+                self.cache.put(self.threshold, *cache_key)
 
         image_width = self.image.shape[1]
         image_height = self.image.shape[0]
@@ -295,14 +453,64 @@ class Lattice(BaseParser):
             table_bbox, vertical_segments, horizontal_segments, pdf_scalers
         )
 
+    def _generate_table_bbox_from_vectors(self):
+        """Generates table boundaries and line segments from the lines
+        and rectangles drawn in the PDF.
+
+        Returns
+        -------
+        found : bool
+            False if the page has no vector ruling lines.
+
+        """
+
+        def parse_areas(areas):
+            parsed_areas = []
+            for area in areas:
+                x1, y1, x2, y2 = [float(a) for a in area.split(",")]
+                parsed_areas.append((x1, y2, x2, y1))
+            return parsed_areas
+
+        curves = get_text_objects(self.layout, ltype="curve")
+        regions = None
+        if self.table_areas is None and self.table_regions is not None:
+            regions = parse_areas(self.table_regions)
+
+        vertical_segments, horizontal_segments = [
+            vector_processing.find_lines(
+                curves,
+                self.pdf_width,
+                self.pdf_height,
+                regions=regions,
+                direction=direction,
+                line_scale=self.line_scale,
+                line_tol=self.line_tol,
+            )
+            for direction in ["vertical", "horizontal"]
+        ]
+        if not vertical_segments and not horizontal_segments:
+            return False
+
+        if self.table_areas is None:
+            contours = vector_processing.find_contours(
+                vertical_segments, horizontal_segments, joint_tol=self.joint_tol
+            )
+        else:
+            contours = parse_areas(self.table_areas)
+        self.table_bbox = vector_processing.find_joints(
+            contours, vertical_segments, horizontal_segments, joint_tol=self.joint_tol
+        )
+        self.table_bbox_unscaled = copy.deepcopy(self.table_bbox)
+        self.vertical_segments = vertical_segments
+        self.horizontal_segments = horizontal_segments
+        return True
+
     def _generate_columns_and_rows(self, table_idx, tk):
         # select elements which lie within table_bbox
         t_bbox = {}
-        v_s, h_s = segments_in_bbox(
-            tk, self.vertical_segments, self.horizontal_segments
-        )
-        t_bbox["horizontal"] = text_in_bbox(tk, self.horizontal_text)
-        t_bbox["vertical"] = text_in_bbox(tk, self.vertical_text)
+        v_s, h_s = self.segment_index.in_bbox(tk)
+        t_bbox["horizontal"] = self.horizontal_text_index.in_bbox(tk)
+        t_bbox["vertical"] = self.vertical_text_index.in_bbox(tk)
 
         t_bbox["horizontal"].sort(key=lambda x: (-x.y0, x.x0))
         t_bbox["vertical"].sort(key=lambda x: (x.x0, -x.y0))
@@ -337,10 +545,13 @@ class Lattice(BaseParser):
         table = table.set_span()
 
         pos_errors = []
+        cell_index = CellIndex(table)
         # TODO: have a single list in place of two directional ones?
         # sorted on x-coordinate based on reading order i.e. LTR or RTL
         for direction in ["vertical", "horizontal"]:
-            for t in self.t_bbox[direction]:
+            lines = getattr(self, "{}_lines".format(direction))
+            cells = cell_index.locate(self.t_bbox[direction], lines=lines)
+            for t, cell in zip(self.t_bbox[direction], cells):
                 indices, error = get_table_index(
                     table,
                     t,
@@ -348,6 +559,8 @@ class Lattice(BaseParser):
                     split_text=self.split_text,
                     flag_size=self.flag_size,
                     strip_text=self.strip_text,
+                    cell=cell,
+                    lines=lines,
                 )
                 if indices[:2] != (-1, -1):
                     pos_errors.append(error)
@@ -355,7 +568,7 @@ class Lattice(BaseParser):
                         table, indices, shift_text=self.shift_text
                     )
                     for r_idx, c_idx, text in indices:
-                        table.cells[r_idx][c_idx].text = text
+                        table.set_text(r_idx, c_idx, text)
         accuracy = compute_accuracy([[100, pos_errors]])
 
         if self.copy_text is not None:
@@ -373,18 +586,27 @@ class Lattice(BaseParser):
         table.page = int(os.path.basename(self.rootname).replace("page-", ""))
 
         # for plotting
-        _text = []
-        _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.horizontal_text])
-        _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.vertical_text])
-        table._text = _text
-        table._image = (self.image, self.table_bbox_unscaled)
-        table._segments = (self.vertical_segments, self.horizontal_segments)
-        table._textedges = None
+        table._text = table._image = table._segments = table._textedges = None
+        if self.keep_debug_data:
+            _text = []
+            _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.horizontal_text])
+            _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.vertical_text])
+            table._text = _text
+            table._image = (self.image, self.table_bbox_unscaled)
+            table._segments = (self.vertical_segments, self.horizontal_segments)
 
         return table
 
-    def extract_tables(self, filename, suppress_stdout=False, layout_kwargs={}):
-        self._generate_layout(filename, layout_kwargs)
+    def extract_tables(
+        self,
+        filename,
+        suppress_stdout=False,
+        layout_kwargs={},
+        layout=None,
+        imagename=None,
+        cache=None,
+    ):
+        self._generate_layout(filename, layout_kwargs, layout=layout, cache=cache)
         if not suppress_stdout:
             logger.info("Processing {}".format(os.path.basename(self.rootname)))
 
@@ -400,8 +622,23 @@ class Lattice(BaseParser):
                 )
             return []
 
-        self._generate_image()
-        self._generate_table_bbox()
+        self._tempdir = None
+        self.imagename = imagename
+        self.image = None
+        try:
+            found = False
+            # background lines can only be found on an image
+            if self.line_source == "vector" and not self.process_background:
+                found = self._generate_table_bbox_from_vectors()
+            if not found:
+                self._generate_image()
+                self._generate_table_bbox()
+        finally:
+            if self._tempdir is not None:
+                shutil.rmtree(self._tempdir)
+        self.segment_index = SegmentIndex(
+            self.vertical_segments, self.horizontal_segments
+        )
 
         _tables = []
         # sort tables based on y-coord
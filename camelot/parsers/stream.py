@@ -5,12 +5,19 @@ import os
 import logging
 import warnings
 
-import numpy as np
 import pandas as pd
 
 from .base import BaseParser
 from ..core import TextEdges, Table
-from ..utils import text_in_bbox, get_table_index, compute_accuracy, compute_whitespace
+from ..utils import (
+    TextIndex,
+    CellIndex,
+    isclose,
+    group_close,
+    get_table_index,
+    compute_accuracy,
+    compute_whitespace,
+)
 
 
 logger = logging.getLogger("camelot")
@@ -52,6 +59,10 @@ class Stream(BaseParser):
     column_tol : int, optional (default: 0)
         Tolerance parameter used to combine text horizontally,
         to generate columns.
+    keep_debug_data : bool, optional (default: True)
+        Keep the text, ruling lines, text edges and page image used by
+        camelot.plot on each table. Set it to False when tables won't
+        be plotted, so that they don't keep a copy of the page image.
 
     """
 
@@ -66,6 +77,7 @@ class Stream(BaseParser):
         edge_tol=50,
         row_tol=2,
         column_tol=0,
+        keep_debug_data=True,
         **kwargs
     ):
         self.table_regions = table_regions
@@ -78,6 +90,7 @@ class Stream(BaseParser):
         self.edge_tol = edge_tol
         self.row_tol = row_tol
         self.column_tol = column_tol
+        self.keep_debug_data = keep_debug_data
 
     @staticmethod
     def _text_bbox(t_bbox):
@@ -103,7 +116,7 @@ class Stream(BaseParser):
         return text_bbox
 
     @staticmethod
-    def _group_rows(text, row_tol=2):
+    def _group_rows(text, row_tol=2, lines=None):
         """Groups PDFMiner text objects into rows vertically
         within a tolerance.
 
@@ -112,6 +125,8 @@ class Stream(BaseParser):
         text : list
             List of PDFMiner text objects.
         row_tol : int, optional (default: 2)
+        lines : camelot.utils.TextLineTable, optional (default: None)
+            Table to look up the text of text objects in.
 
         Returns
         -------
@@ -119,20 +134,24 @@ class Stream(BaseParser):
             Two-dimensional list of text objects grouped into rows.
 
         """
-        row_y = 0
+        # is checking for upright necessary?
+        # if t.get_text().strip() and all([obj.upright for obj in t._objs if
+        # type(obj) is LTChar]):
+        if lines is None:
+            text = [t for t in text if t.get_text().strip()]
+            y0s = [t.y0 for t in text]
+            x0s = [t.x0 for t in text]
+        else:
+            text = [t for t in text if lines.get_text(t).strip()]
+            text_lines = lines.lookup(text)
+            y0s = text_lines.y0.tolist()
+            x0s = text_lines.x0.tolist()
+        # a row starting at y = 0 is added in front of the text
+        groups, __ = group_close([0] + y0s, atol=row_tol)
         rows = []
-        temp = []
-        for t in text:
-            # is checking for upright necessary?
-            # if t.get_text().strip() and all([obj.upright for obj in t._objs if
-            # type(obj) is LTChar]):
-            if t.get_text().strip():
-                if not np.isclose(row_y, t.y0, atol=row_tol):
-                    rows.append(sorted(temp, key=lambda t: t.x0))
-                    temp = []
-                    row_y = t.y0
-                temp.append(t)
-        rows.append(sorted(temp, key=lambda t: t.x0))
+        for group in groups:
+            indices = sorted([i - 1 for i in group if i > 0], key=x0s.__getitem__)
+            rows.append([text[i] for i in indices])
         __ = rows.pop(0)  # TODO: hacky
         return rows
 
@@ -160,7 +179,7 @@ class Stream(BaseParser):
             else:
                 lower = merged[-1]
                 if column_tol >= 0:
-                    if higher[0] <= lower[1] or np.isclose(
+                    if higher[0] <= lower[1] or isclose(
                         higher[0], lower[1], atol=column_tol
                     ):
                         upper_bound = max(lower[1], higher[1])
@@ -170,7 +189,7 @@ class Stream(BaseParser):
                         merged.append(higher)
                 elif column_tol < 0:
                     if higher[0] <= lower[1]:
-                        if np.isclose(higher[0], lower[1], atol=abs(column_tol)):
+                        if isclose(higher[0], lower[1], atol=abs(column_tol)):
                             merged.append(higher)
                         else:
                             upper_bound = max(lower[1], higher[1])
@@ -208,7 +227,7 @@ class Stream(BaseParser):
         return rows
 
     @staticmethod
-    def _add_columns(cols, text, row_tol):
+    def _add_columns(cols, text, row_tol, lines=None):
         """Adds columns to existing list by taking into account
         the text that lies outside the current column x-coordinates.
 
@@ -219,6 +238,8 @@ class Stream(BaseParser):
         text : list
             List of PDFMiner text objects.
         ytol : int
+        lines : camelot.utils.TextLineTable, optional (default: None)
+            Table to look up the text of text objects in.
 
         Returns
         -------
@@ -227,7 +248,7 @@ class Stream(BaseParser):
 
         """
         if text:
-            text = Stream._group_rows(text, row_tol=row_tol)
+            text = Stream._group_rows(text, row_tol=row_tol, lines=lines)
             elements = [len(r) for r in text]
             new_cols = [
                 (t.x0, t.x1) for r in text if len(r) == max(elements) for t in r
@@ -277,7 +298,7 @@ class Stream(BaseParser):
         textlines.sort(key=lambda x: (-x.y0, x.x0))
         textedges = TextEdges(edge_tol=self.edge_tol)
         # generate left, middle and right textedges
-        textedges.generate(textlines)
+        textedges.generate(textlines, lines=self.horizontal_lines)
         # select relevant edges
         relevant_textedges = textedges.get_relevant()
         self.textedges.extend(relevant_textedges)
@@ -292,6 +313,15 @@ class Stream(BaseParser):
     def _generate_table_bbox(self):
         self.textedges = []
         if self.table_areas is None:
+            if self.table_regions is None:
+                # put text in reading order once, so that sorting it
+                # for table detection leaves the indexes valid
+                lines = self.horizontal_lines.take(
+                    self.horizontal_lines.reading_order()
+                )
+                self.horizontal_lines = lines
+                self.horizontal_text[:] = lines.textlines
+                self.horizontal_text_index = TextIndex(lines)
             hor_text = self.horizontal_text
             if self.table_regions is not None:
                 # filter horizontal text
@@ -302,7 +332,7 @@ class Stream(BaseParser):
                     y1 = float(y1)
                     x2 = float(x2)
                     y2 = float(y2)
-                    region_text = text_in_bbox((x1, y2, x2, y1), self.horizontal_text)
+                    region_text = self.horizontal_text_index.in_bbox((x1, y2, x2, y1))
                     hor_text.extend(region_text)
             # find tables based on nurminen's detection algorithm
             table_bbox = self._nurminen_table_detection(hor_text)
@@ -320,8 +350,8 @@ class Stream(BaseParser):
     def _generate_columns_and_rows(self, table_idx, tk):
         # select elements which lie within table_bbox
         t_bbox = {}
-        t_bbox["horizontal"] = text_in_bbox(tk, self.horizontal_text)
-        t_bbox["vertical"] = text_in_bbox(tk, self.vertical_text)
+        t_bbox["horizontal"] = self.horizontal_text_index.in_bbox(tk)
+        t_bbox["vertical"] = self.vertical_text_index.in_bbox(tk)
 
         t_bbox["horizontal"].sort(key=lambda x: (-x.y0, x.x0))
         t_bbox["vertical"].sort(key=lambda x: (x.x0, -x.y0))
@@ -329,7 +359,9 @@ class Stream(BaseParser):
         self.t_bbox = t_bbox
 
         text_x_min, text_y_min, text_x_max, text_y_max = self._text_bbox(self.t_bbox)
-        rows_grouped = self._group_rows(self.t_bbox["horizontal"], row_tol=self.row_tol)
+        rows_grouped = self._group_rows(
+            self.t_bbox["horizontal"], row_tol=self.row_tol, lines=self.horizontal_lines
+        )
         rows = self._join_rows(rows_grouped, text_y_max, text_y_min)
         elements = [len(r) for r in rows_grouped]
 
@@ -381,7 +413,9 @@ class Stream(BaseParser):
                 if t.x0 > cols[-1][1] or t.x1 < cols[0][0]
             ]
             inner_text.extend(outer_text)
-            cols = self._add_columns(cols, inner_text, self.row_tol)
+            cols = self._add_columns(
+                cols, inner_text, self.row_tol, lines=self.horizontal_lines
+            )
             cols = self._join_columns(cols, text_x_min, text_x_max)
 
         return cols, rows
@@ -391,10 +425,13 @@ class Stream(BaseParser):
         table = table.set_all_edges()
 
         pos_errors = []
+        cell_index = CellIndex(table)
         # TODO: have a single list in place of two directional ones?
         # sorted on x-coordinate based on reading order i.e. LTR or RTL
         for direction in ["vertical", "horizontal"]:
-            for t in self.t_bbox[direction]:
+            lines = getattr(self, "{}_lines".format(direction))
+            cells = cell_index.locate(self.t_bbox[direction], lines=lines)
+            for t, cell in zip(self.t_bbox[direction], cells):
                 indices, error = get_table_index(
                     table,
                     t,
@@ -402,11 +439,13 @@ class Stream(BaseParser):
                     split_text=self.split_text,
                     flag_size=self.flag_size,
                     strip_text=self.strip_text,
+                    cell=cell,
+                    lines=lines,
                 )
                 if indices[:2] != (-1, -1):
                     pos_errors.append(error)
                     for r_idx, c_idx, text in indices:
-                        table.cells[r_idx][c_idx].text = text
+                        table.set_text(r_idx, c_idx, text)
         accuracy = compute_accuracy([[100, pos_errors]])
 
         data = table.data
@@ -421,18 +460,20 @@ class Stream(BaseParser):
         table.page = int(os.path.basename(self.rootname).replace("page-", ""))
 
         # for plotting
-        _text = []
-        _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.horizontal_text])
-        _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.vertical_text])
-        table._text = _text
-        table._image = None
-        table._segments = None
-        table._textedges = self.textedges
+        table._text = table._image = table._segments = table._textedges = None
+        if self.keep_debug_data:
+            _text = []
+            _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.horizontal_text])
+            _text.extend([(t.x0, t.y0, t.x1, t.y1) for t in self.vertical_text])
+            table._text = _text
+            table._textedges = self.textedges
 
         return table
 
-    def extract_tables(self, filename, suppress_stdout=False, layout_kwargs={}):
-        self._generate_layout(filename, layout_kwargs)
+    def extract_tables(
+        self, filename, suppress_stdout=False, layout_kwargs={}, layout=None, cache=None
+    ):
+        self._generate_layout(filename, layout_kwargs, layout=layout, cache=cache)
         if not suppress_stdout:
             logger.info("Processing {}".format(os.path.basename(self.rootname)))
 
@@ -33,6 +33,12 @@ class PlotMethods(object):
         if not _HAS_MPL:
             raise ImportError("matplotlib is required for plotting.")
 
+        if table._text is None:
+            raise ValueError(
+                "Table has no plotting data, it was parsed with"
+                " keep_debug_data=False"
+            )
+
         if table.flavor == "lattice" and kind in ["textedge"]:
             raise NotImplementedError(
                 "Lattice flavor does not support kind='{}'".format(kind)
@@ -111,7 +117,8 @@ class PlotMethods(object):
         """
         try:
             img, table_bbox = table._image
-            _FOR_LATTICE = True
+            # lines found without an image are in pdf coordinate space
+            _FOR_LATTICE = img is not None
         except TypeError:
             img, table_bbox = (None, {table._bbox: None})
             _FOR_LATTICE = False
@@ -142,7 +149,7 @@ class PlotMethods(object):
                 ax.set_ylim(min(ys) - 10, max(ys) + 10)
 
         if _FOR_LATTICE:
-            ax.imshow(img)
+            ax.imshow(img, cmap="gray", vmin=0, vmax=255)
         return fig
 
     def textedge(self, table):
@@ -197,7 +204,8 @@ class PlotMethods(object):
                 x_coord.append(coord[0])
                 y_coord.append(coord[1])
         ax.plot(x_coord, y_coord, "ro")
-        ax.imshow(img)
+        if img is not None:
+            ax.imshow(img, cmap="gray", vmin=0, vmax=255)
         return fig
 
     def line(self, table):
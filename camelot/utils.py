@@ -4,11 +4,12 @@ from __future__ import division
 import re
 import os
 import sys
-import random
+import base64
 import shutil
-import string
+import socket
 import tempfile
 import warnings
+import threading
 from itertools import groupby
 from operator import itemgetter
 
@@ -27,19 +28,34 @@ from pdfminer.layout import (
     LTTextLineHorizontal,
     LTTextLineVertical,
     LTImage,
+    LTCurve,
 )
 
 
 PY3 = sys.version_info[0] >= 3
 if PY3:
-    from urllib.request import urlopen
+    from http.client import (
+        HTTPConnection,
+        HTTPSConnection,
+        HTTPException,
+        IncompleteRead,
+    )
+    from urllib.error import HTTPError, URLError
+    from urllib.request import urlopen, getproxies, proxy_bypass
+    from urllib.parse import urljoin, unquote
     from urllib.parse import urlparse as parse_url
     from urllib.parse import uses_relative, uses_netloc, uses_params
 else:
-    from urllib2 import urlopen
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException, IncompleteRead
+    from urllib import getproxies, proxy_bypass, unquote
+    from urllib2 import urlopen, HTTPError, URLError
+    from urlparse import urljoin
     from urlparse import urlparse as parse_url
     from urlparse import uses_relative, uses_netloc, uses_params
 
+# click and PyPDF2 return unicode strings on Python 2
+string_types = str if PY3 else basestring  # noqa: F821
+
 
 _VALID_URLS = set(uses_relative + uses_netloc + uses_params)
 _VALID_URLS.discard("")
@@ -65,41 +81,273 @@ def is_url(url):
         return False
 
 
-def random_string(length):
-    ret = ""
-    while length:
-        ret += random.choice(
-            string.digits + string.ascii_lowercase + string.ascii_uppercase
-        )
-        length -= 1
-    return ret
+# maximum size in bytes of a file downloaded by download_url, None
+# means that there is no limit
+DOWNLOAD_MAX_SIZE = None
+# size of the chunks in which downloads are written to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# number of times an interrupted download is resumed or restarted
+DOWNLOAD_RETRIES = 3
+# number of redirects followed by a download
+DOWNLOAD_MAX_REDIRECTS = 5
+
+
+def _get_proxy(scheme, netloc):
+    """Returns the parsed URL of the proxy that urlopen would use for
+    a host, from the *_proxy environment variables or the system
+    settings, or None if the host is reached directly.
+    """
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(parse_url("//" + netloc).hostname or ""):
+        return None
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    return parse_url(proxy)
+
+
+def _proxy_headers(proxy):
+    if proxy is None or proxy.username is None:
+        return {}
+    credentials = "{}:{}".format(unquote(proxy.username), unquote(proxy.password or ""))
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": "Basic {}".format(token)}
+
+
+def _check_content_type(headers):
+    content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type != "application/pdf":
+        raise NotImplementedError("File format not supported")
+
+
+def _check_size(size, max_size):
+    if max_size is not None and size > max_size:
+        raise ValueError("File is larger than {} bytes".format(max_size))
+
+
+def _copy_response(response, f, max_size, received=0):
+    """Writes the body of a response to a file in chunks, and
+    returns the total number of bytes written to the file.
+    """
+    while True:
+        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+        if not chunk:
+            return received
+        received += len(chunk)
+        _check_size(received, max_size)
+        f.write(chunk)
+
+
+class HTTPConnectionPool(object):
+    """Keeps HTTP and HTTPS connections open after a download, so
+    that later downloads from the same host reuse them. Proxies are
+    picked like urlopen does. HTTPS requests are tunneled through the
+    proxy with CONNECT.
+
+    Parameters
+    ----------
+    maxsize : int, optional (default: 4)
+        Maximum number of idle connections kept for each host.
+    timeout : float, optional (default: 60)
+        Timeout in seconds of connection attempts and reads.
 
+    """
 
-def download_url(url):
+    def __init__(self, maxsize=4, timeout=60):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, key, proxy=None):
+        with self._lock:
+            connections = self._idle.get(key)
+            if connections:
+                return connections.pop(), True
+        scheme, netloc, __ = key
+        cls = HTTPSConnection if scheme == "https" else HTTPConnection
+        if proxy is None:
+            return cls(netloc, timeout=self.timeout), False
+        conn = cls(proxy.hostname, proxy.port, timeout=self.timeout)
+        if scheme == "https":
+            conn.set_tunnel(netloc, headers=_proxy_headers(proxy))
+        return conn, False
+
+    def _release(self, key, conn, response):
+        if response.will_close:
+            conn.close()
+            return
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.maxsize:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        """Closes all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _request(self, url, headers):
+        """Sends a GET request and follows redirects.
+
+        Returns
+        -------
+        response : http.client.HTTPResponse
+        key : tuple
+            Tuple (scheme, netloc, proxy netloc) of the host that sent
+            the response.
+        conn : http.client.HTTPConnection
+            Connection on which the response is read.
+
+        """
+        for __ in range(DOWNLOAD_MAX_REDIRECTS + 1):
+            u = parse_url(url)
+            proxy = _get_proxy(u.scheme, u.netloc)
+            key = (u.scheme, u.netloc, None if proxy is None else proxy.netloc)
+            path = u.path or "/"
+            if u.query:
+                path = "?".join([path, u.query])
+            request_headers = dict(headers)
+            if proxy is not None and u.scheme == "http":
+                # requests to an HTTP proxy carry the whole URL
+                path = u._replace(fragment="").geturl()
+                request_headers.update(_proxy_headers(proxy))
+            conn, reused = self._connect(key, proxy)
+            try:
+                conn.request("GET", path, headers=request_headers)
+                response = conn.getresponse()
+            except (HTTPException, socket.error) as e:
+                conn.close()
+                if not reused:
+                    # raise the same error as urlopen
+                    raise URLError(e)
+                # the server closed the idle connection, retry with a
+                # new one
+                conn, __ = self._connect(key, proxy)
+                try:
+                    conn.request("GET", path, headers=request_headers)
+                    response = conn.getresponse()
+                except (HTTPException, socket.error) as e:
+                    conn.close()
+                    raise URLError(e)
+
+            location = response.getheader("Location")
+            if response.status in [301, 302, 303, 307, 308] and location:
+                response.read()
+                self._release(key, conn, response)
+                url = urljoin(url, location)
+                continue
+            if response.status >= 300:
+                conn.close()
+                raise HTTPError(
+                    url, response.status, response.reason, response.msg, None
+                )
+            return response, key, conn
+        conn.close()
+        raise HTTPError(url, response.status, "Too many redirects", response.msg, None)
+
+    def download(self, url, f, max_size=None):
+        """Streams the file at a URL to a file object. If the download
+        is interrupted, it is resumed with a Range request if the
+        server supports them, or restarted otherwise.
+
+        Parameters
+        ----------
+        url : str
+            HTTP or HTTPS URL.
+        f : file
+            File object opened for writing in binary mode.
+        max_size : int, optional (default: None)
+            Maximum size of the file in bytes.
+
+        """
+        received = 0
+        accept_ranges = False
+        retries = 0
+        while True:
+            headers = {}
+            if received and accept_ranges:
+                headers["Range"] = "bytes={}-".format(received)
+            response, key, conn = self._request(url, headers)
+            try:
+                if "Range" in headers and response.status == 206:
+                    content_range = response.getheader("Content-Range", "")
+                    if not content_range.startswith("bytes {}-".format(received)):
+                        accept_ranges = False
+                        raise HTTPException("Unexpected Content-Range")
+                else:
+                    _check_content_type(response.msg)
+                    accept_ranges = response.getheader("Accept-Ranges") == "bytes"
+                    f.seek(0)
+                    f.truncate()
+                    received = 0
+                length = response.getheader("Content-Length")
+                if length is not None:
+                    length = received + int(length)
+                    _check_size(length, max_size)
+                received = _copy_response(response, f, max_size, received=received)
+                # reads return what was received when the connection
+                # is closed early instead of raising
+                if length is not None and received < length:
+                    raise IncompleteRead(b"", length - received)
+            except (HTTPException, socket.error):
+                conn.close()
+                if retries >= DOWNLOAD_RETRIES:
+                    raise
+                retries += 1
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            self._release(key, conn, response)
+            return
+
+
+_http_pool = HTTPConnectionPool()
+
+
+def download_url(url, max_size=None):
     """Download file from specified URL.
 
+    The file is streamed to disk in chunks. HTTP and HTTPS connections
+    are kept open in a pool shared by all downloads, and interrupted
+    downloads are resumed using Range requests when the server
+    supports them.
+
     Parameters
     ----------
     url : str or unicode
+    max_size : int, optional (default: None)
+        Maximum size of the file in bytes, above which a ValueError is
+        raised. Defaults to DOWNLOAD_MAX_SIZE.
 
     Returns
     -------
     filepath : str or unicode
-        Temporary filepath.
+        Temporary filepath. It should be removed by the caller.
 
     """
-    filename = "{}.pdf".format(random_string(6))
-    with tempfile.NamedTemporaryFile("wb", delete=False) as f:
-        obj = urlopen(url)
-        if PY3:
-            content_type = obj.info().get_content_type()
-        else:
-            content_type = obj.info().getheader("Content-Type")
-        if content_type != "application/pdf":
-            raise NotImplementedError("File format not supported")
-        f.write(obj.read())
-    filepath = os.path.join(os.path.dirname(f.name), filename)
-    shutil.move(f.name, filepath)
+    if max_size is None:
+        max_size = DOWNLOAD_MAX_SIZE
+    fd, filepath = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if parse_url(url).scheme in ["http", "https"]:
+                _http_pool.download(url, f, max_size=max_size)
+            else:
+                obj = urlopen(url)
+                try:
+                    _check_content_type(obj.info())
+                    _copy_response(obj, f, max_size)
+                finally:
+                    obj.close()
+    except BaseException:
+        os.remove(filepath)
+        raise
     return filepath
 
 
@@ -115,6 +363,8 @@ lattice_kwargs = [
     "threshold_constant",
     "iterations",
     "resolution",
+    "backend",
+    "line_source",
 ]
 
 
@@ -314,6 +564,39 @@ def get_rotation(chars, horizontal_text, vertical_text):
     return rotation
 
 
+def get_ruling_width(curves, max_width=2):
+    """Returns the width of the thinnest ruling line drawn on a page.
+
+    Parameters
+    ----------
+    curves : list
+        List of PDFMiner LTCurve objects (including LTLine and LTRect).
+    max_width : float, optional (default: 2)
+        Filled rectangles that are thinner than this many points are
+        treated as ruling lines.
+
+    Returns
+    -------
+    width : float
+        Width in points, or None if no ruling lines with a known
+        width were found. Hairlines (zero line width) are ignored
+        since they are always rendered one pixel wide.
+
+    """
+    widths = []
+    for c in curves:
+        # layouts made by camelot.utils.PageAggregator have line widths
+        # in page space
+        linewidth = getattr(c, "page_linewidth", c.linewidth)
+        if c.stroke and linewidth > 0:
+            widths.append(linewidth)
+        elif c.fill and 0 < min(c.width, c.height) <= max_width:
+            widths.append(min(c.width, c.height))
+    if not widths:
+        return None
+    return min(widths)
+
+
 def segments_in_bbox(bbox, v_segments, h_segments):
     """Returns all line segments present inside a bounding box.
 
@@ -379,6 +662,248 @@ def text_in_bbox(bbox, text):
     return t_bbox
 
 
+class TextLineTable(object):
+    """Column-oriented store of the text lines on a page, built once
+    so that parsers don't read the coordinates and rebuild the text of
+    PDFMiner objects over and over again.
+
+    Parameters
+    ----------
+    textlines : list
+        List of PDFMiner LTTextLine objects.
+
+    Attributes
+    ----------
+    x0, y0, x1, y1 : numpy.ndarray
+        Coordinates of the text lines.
+    text : list
+        Text of the text lines.
+
+    """
+
+    def __init__(self, textlines, text=None, coords=None):
+        self.textlines = textlines
+        if coords is None:
+            coords = [
+                np.array([getattr(t, c) for t in textlines], dtype=float)
+                for c in ["x0", "y0", "x1", "y1"]
+            ]
+        self.x0, self.y0, self.x1, self.y1 = coords
+        if text is None:
+            text = [t.get_text() for t in textlines]
+        self.text = text
+        self._rows = {id(t): i for i, t in enumerate(textlines)}
+
+    def __len__(self):
+        return len(self.textlines)
+
+    def take(self, indices):
+        """Returns a table with the text lines at the given indices,
+        in the given order.
+        """
+        indices = np.asarray(indices, dtype=int)
+        return TextLineTable(
+            [self.textlines[i] for i in indices],
+            text=[self.text[i] for i in indices],
+            coords=[
+                self.x0[indices],
+                self.y0[indices],
+                self.x1[indices],
+                self.y1[indices],
+            ],
+        )
+
+    def lookup(self, textlines):
+        """Returns a table with the given text lines, in the given
+        order. Their coordinates and text are taken from this table,
+        and are only read from the PDFMiner objects if some text line
+        isn't in it.
+        """
+        indices = [self._rows.get(id(t)) for t in textlines]
+        if None in indices:
+            return TextLineTable(textlines, text=[self.get_text(t) for t in textlines])
+        return self.take(indices)
+
+    def reading_order(self):
+        """Returns the indices that sort the text lines from top to
+        bottom and left to right, like sorting them with the key
+        (-y0, x0).
+        """
+        return np.lexsort((self.x0, -self.y0))
+
+    def get_text(self, textline):
+        """Returns the text of a text line, which is only rebuilt from
+        its characters if the text line isn't in the table.
+        """
+        i = self._rows.get(id(textline))
+        if i is None:
+            return textline.get_text()
+        return self.text[i]
+
+
+class TextIndex(object):
+    """Index of text objects sorted by the x coordinate of their
+    center, which answers the same queries as text_in_bbox without
+    scanning all text objects on the page.
+
+    Parameters
+    ----------
+    lines : camelot.utils.TextLineTable
+        Table of the text lines to index.
+
+    """
+
+    def __init__(self, lines):
+        self.text = lines.textlines
+        xs = (lines.x0 + lines.x1) / 2.0
+        self._order = np.argsort(xs, kind="mergesort")
+        self._xs = xs[self._order]
+        self._ys = (lines.y0 + lines.y1) / 2.0
+
+    def in_bbox(self, bbox):
+        """Returns all text objects present inside a bounding box, in
+        the same order as text_in_bbox.
+
+        Parameters
+        ----------
+        bbox : tuple
+            Tuple (x1, y1, x2, y2) representing a bounding box where
+            (x1, y1) -> lb and (x2, y2) -> rt in the PDF coordinate
+            space.
+
+        Returns
+        -------
+        t_bbox : list
+            List of PDFMiner text objects that lie inside table.
+
+        """
+        lo = np.searchsorted(self._xs, bbox[0] - 2, side="left")
+        hi = np.searchsorted(self._xs, bbox[2] + 2, side="right")
+        idx = self._order[lo:hi]
+        ys = self._ys[idx]
+        idx = np.sort(idx[(bbox[1] - 2 <= ys) & (ys <= bbox[3] + 2)])
+        return [self.text[i] for i in idx]
+
+
+class SegmentIndex(object):
+    """Index of vertical segments sorted by their x coordinate and
+    horizontal segments sorted by their y coordinate, which answers
+    the same queries as segments_in_bbox without scanning all segments
+    on the page.
+
+    Parameters
+    ----------
+    v_segments : list
+        List of vertical line segments.
+    h_segments : list
+        List of horizontal line segments.
+
+    """
+
+    def __init__(self, v_segments, h_segments):
+        self.v_segments = v_segments
+        self.h_segments = h_segments
+        v = np.asarray(v_segments, dtype=float).reshape(-1, 4)
+        h = np.asarray(h_segments, dtype=float).reshape(-1, 4)
+        self._v_order = np.argsort(v[:, 0], kind="mergesort")
+        self._v = v[self._v_order]
+        self._h_order = np.argsort(h[:, 1], kind="mergesort")
+        self._h = h[self._h_order]
+
+    def in_bbox(self, bbox):
+        """Returns all line segments present inside a bounding box, in
+        the same order as segments_in_bbox.
+
+        Parameters
+        ----------
+        bbox : tuple
+            Tuple (x1, y1, x2, y2) representing a bounding box where
+            (x1, y1) -> lb and (x2, y2) -> rt in PDFMiner coordinate
+            space.
+
+        Returns
+        -------
+        v_s : list
+            List of vertical line segments that lie inside table.
+        h_s : list
+            List of horizontal line segments that lie inside table.
+
+        """
+        lo = np.searchsorted(self._v[:, 0], bbox[0] - 2, side="left")
+        hi = np.searchsorted(self._v[:, 0], bbox[2] + 2, side="right")
+        v = self._v[lo:hi]
+        inside = (v[:, 1] > bbox[1] - 2) & (v[:, 3] < bbox[3] + 2)
+        v_idx = np.sort(self._v_order[lo:hi][inside])
+
+        lo = np.searchsorted(self._h[:, 1], bbox[1] - 2, side="left")
+        hi = np.searchsorted(self._h[:, 1], bbox[3] + 2, side="right")
+        h = self._h[lo:hi]
+        inside = (h[:, 0] > bbox[0] - 2) & (h[:, 2] < bbox[2] + 2)
+        h_idx = np.sort(self._h_order[lo:hi][inside])
+
+        v_s = [self.v_segments[i] for i in v_idx]
+        h_s = [self.h_segments[i] for i in h_idx]
+        return v_s, h_s
+
+
+def isclose(a, b, atol=0):
+    """Returns True if two numbers are equal within a tolerance, like
+    np.isclose(a, b, atol=atol) does, without creating arrays.
+
+    Parameters
+    ----------
+    a : float
+    b : float
+    atol : float, optional (default: 0)
+        Absolute tolerance. A relative tolerance of 1e-05 times the
+        magnitude of b is added to it.
+
+    Returns
+    -------
+    close : bool
+
+    """
+    return abs(a - b) <= atol + 1e-05 * abs(b)
+
+
+def group_close(values, atol=0, moving_mean=False):
+    """Groups consecutive values which lie within a tolerance of their
+    group in one pass, comparing them like isclose(ref, value, atol)
+    where ref represents the group the previous value belongs to.
+
+    Parameters
+    ----------
+    values : list
+        List of numbers.
+    atol : float, optional (default: 0)
+        Absolute tolerance.
+    moving_mean : bool, optional (default: False)
+        Whether a group is represented by the moving mean of its
+        values, which is updated as (ref + value) / 2, or by its
+        first value.
+
+    Returns
+    -------
+    groups : list
+        List of lists with the indices of the values in each group.
+    refs : list
+        List with the value that represents each group.
+
+    """
+    values = np.asarray(values, dtype=float).reshape(-1)
+    tols = (atol + 1e-05 * np.abs(values)).tolist()
+    groups, refs = [], []
+    for i, (v, tol) in enumerate(zip(values.tolist(), tols)):
+        if groups and abs(refs[-1] - v) <= tol:
+            groups[-1].append(i)
+            if moving_mean:
+                refs[-1] = (refs[-1] + v) / 2.0
+        else:
+            groups.append([i])
+            refs.append(v)
+    return groups, refs
+
+
 def merge_close_lines(ar, line_tol=2):
     """Merges lines which are within a tolerance by calculating a
     moving mean, based on their x or y axis projections.
@@ -393,17 +918,7 @@ def merge_close_lines(ar, line_tol=2):
     ret : list
 
     """
-    ret = []
-    for a in ar:
-        if not ret:
-            ret.append(a)
-        else:
-            temp = ret[-1]
-            if np.isclose(temp, a, atol=line_tol):
-                temp = (temp + a) / 2.0
-                ret[-1] = temp
-            else:
-                ret.append(a)
+    __, ret = group_close(ar, atol=line_tol, moving_mean=True)
     return ret
 
 
@@ -527,11 +1042,9 @@ def split_textline(table, textline, direction, flag_size=False, strip_text=""):
                 if r[1] <= (bbox[1] + bbox[3]) / 2 <= r[0]
             ]
             r = r_idx[0]
-            x_cuts = [
-                (c, table.cells[r][c].x2) for c in x_overlap if table.cells[r][c].right
-            ]
+            x_cuts = [(c, table.cols[c][1]) for c in x_overlap if table._right[r, c]]
             if not x_cuts:
-                x_cuts = [(x_overlap[0], table.cells[r][-1].x2)]
+                x_cuts = [(x_overlap[0], table.cols[-1][1])]
             for obj in textline._objs:
                 row = table.rows[r]
                 for cut in x_cuts:
@@ -560,11 +1073,9 @@ def split_textline(table, textline, direction, flag_size=False, strip_text=""):
                 if c[0] <= (bbox[0] + bbox[2]) / 2 <= c[1]
             ]
             c = c_idx[0]
-            y_cuts = [
-                (r, table.cells[r][c].y1) for r in y_overlap if table.cells[r][c].bottom
-            ]
+            y_cuts = [(r, table.rows[r][1]) for r in y_overlap if table._bottom[r, c]]
             if not y_cuts:
-                y_cuts = [(y_overlap[0], table.cells[-1][c].y1)]
+                y_cuts = [(y_overlap[0], table.rows[-1][1])]
             for obj in textline._objs:
                 col = table.cols[c]
                 for cut in y_cuts:
@@ -603,8 +1114,124 @@ def split_textline(table, textline, direction, flag_size=False, strip_text=""):
     return grouped_chars
 
 
+class CellIndex(object):
+    """Index of the row and column boundaries of a table, which finds
+    the cells that text objects lie in without scanning all rows and
+    columns for each one. Falls back to a linear scan if the rows or
+    columns aren't sorted.
+
+    Parameters
+    ----------
+    table : camelot.core.Table
+
+    """
+
+    def __init__(self, table):
+        self.table = table
+        rows = np.asarray(table.rows, dtype=float).reshape(-1, 2)
+        cols = np.asarray(table.cols, dtype=float).reshape(-1, 2)
+        # rows are in decreasing order, negate them to search in
+        # increasing order
+        self._neg_tops = -rows[:, 0]
+        self._neg_bottoms = -rows[:, 1]
+        self._starts = cols[:, 0]
+        self._ends = cols[:, 1]
+        self._sorted = (
+            np.all(np.diff(self._neg_tops) >= 0)
+            and np.all(np.diff(self._neg_bottoms) >= 0)
+            and np.all(np.diff(self._starts) >= 0)
+            and np.all(np.diff(self._ends) >= 0)
+        )
+
+    def _get_col_index(self, t, x0, x1, candidates):
+        cols = self.table.cols
+        lt_col_overlap = []
+        for c in candidates:
+            left = x0 if cols[c][0] <= x0 else cols[c][0]
+            right = x1 if cols[c][1] >= x1 else cols[c][1]
+            lt_col_overlap.append(abs(left - right) / abs(cols[c][0] - cols[c][1]))
+        if not lt_col_overlap:
+            text = t.get_text().strip("\n")
+            text_range = (x0, x1)
+            col_range = (cols[0][0], cols[-1][1])
+            warnings.warn(
+                "{} {} does not lie in column range {}".format(
+                    text, text_range, col_range
+                )
+            )
+            return 0
+        return candidates[lt_col_overlap.index(max(lt_col_overlap))]
+
+    def _locate_linear(self, t, x0, mid, x1):
+        rows, cols = self.table.rows, self.table.cols
+        for r in range(len(rows)):
+            if rows[r][1] < mid < rows[r][0]:
+                candidates = [
+                    c for c in range(len(cols)) if cols[c][0] <= x1 and cols[c][1] >= x0
+                ]
+                return r, self._get_col_index(t, x0, x1, candidates)
+        return -1, -1
+
+    def locate(self, textlines, lines=None):
+        """Finds the table cells where text objects lie by comparing
+        their y and x-coordinates.
+
+        Parameters
+        ----------
+        textlines : list
+            List of PDFMiner LTTextLine objects.
+        lines : camelot.utils.TextLineTable, optional (default: None)
+            Table to look up the coordinates of text objects in.
+
+        Returns
+        -------
+        indices : list
+            List of tuples of the form (r_idx, c_idx) where r_idx and
+            c_idx are row and column indices, or (-1, -1) if a text
+            object doesn't lie in any row. The column with the largest
+            overlap is chosen if a text object spans several columns.
+
+        """
+        lines = TextLineTable(textlines) if lines is None else lines.lookup(textlines)
+        mids = (lines.y0 + lines.y1) / 2.0
+        x0s, x1s = lines.x0, lines.x1
+        if not self._sorted:
+            return [
+                self._locate_linear(t, x0, mid, x1)
+                for t, x0, mid, x1 in zip(
+                    textlines, x0s.tolist(), mids.tolist(), x1s.tolist()
+                )
+            ]
+
+        # rows above the first one whose top lies below the text, and
+        # rows below the last one whose bottom lies above the text
+        above = np.searchsorted(self._neg_tops, -mids, side="left")
+        below = np.searchsorted(self._neg_bottoms, -mids, side="right")
+        # columns which overlap the text horizontally
+        first = np.searchsorted(self._ends, x0s, side="left")
+        last = np.searchsorted(self._starts, x1s, side="right")
+
+        x0s, x1s = x0s.tolist(), x1s.tolist()
+        indices = []
+        for i, t in enumerate(textlines):
+            if below[i] < above[i]:
+                candidates = list(range(first[i], last[i]))
+                c = self._get_col_index(t, x0s[i], x1s[i], candidates)
+                indices.append((int(below[i]), c))
+            else:
+                indices.append((-1, -1))
+        return indices
+
+
 def get_table_index(
-    table, t, direction, split_text=False, flag_size=False, strip_text=""
+    table,
+    t,
+    direction,
+    split_text=False,
+    flag_size=False,
+    strip_text="",
+    cell=None,
+    lines=None,
 ):
     """Gets indices of the table cell where given text object lies by
     comparing their y and x-coordinates.
@@ -626,6 +1253,11 @@ def get_table_index(
     strip_text : str, optional (default: '')
         Characters that should be stripped from a string before
         assigning it to a cell.
+    cell : tuple, optional (default: None)
+        Row and column indices of the cell where the text object lies,
+        as returned by CellIndex.locate. They are computed if not given.
+    lines : camelot.utils.TextLineTable, optional (default: None)
+        Table to look up the text of the text object in.
 
     Returns
     -------
@@ -642,31 +1274,9 @@ def get_table_index(
         +-------+
 
     """
-    r_idx, c_idx = [-1] * 2
-    for r in range(len(table.rows)):
-        if (t.y0 + t.y1) / 2.0 < table.rows[r][0] and (t.y0 + t.y1) / 2.0 > table.rows[
-            r
-        ][1]:
-            lt_col_overlap = []
-            for c in table.cols:
-                if c[0] <= t.x1 and c[1] >= t.x0:
-                    left = t.x0 if c[0] <= t.x0 else c[0]
-                    right = t.x1 if c[1] >= t.x1 else c[1]
-                    lt_col_overlap.append(abs(left - right) / abs(c[0] - c[1]))
-                else:
-                    lt_col_overlap.append(-1)
-            if len(list(filter(lambda x: x != -1, lt_col_overlap))) == 0:
-                text = t.get_text().strip("\n")
-                text_range = (t.x0, t.x1)
-                col_range = (table.cols[0][0], table.cols[-1][1])
-                warnings.warn(
-                    "{} {} does not lie in column range {}".format(
-                        text, text_range, col_range
-                    )
-                )
-            r_idx = r
-            c_idx = lt_col_overlap.index(max(lt_col_overlap))
-            break
+    if cell is None:
+        cell = CellIndex(table).locate([t], lines=lines)[0]
+    r_idx, c_idx = cell
 
     # error calculation
     y0_offset, y1_offset, x0_offset, x1_offset = [0] * 4
@@ -703,7 +1313,8 @@ def get_table_index(
                 error,
             )
         else:
-            return [(r_idx, c_idx, text_strip(t.get_text(), strip_text))], error
+            text = t.get_text() if lines is None else lines.get_text(t)
+            return [(r_idx, c_idx, text_strip(text, strip_text))], error
 
 
 def compute_accuracy(error_weights):
@@ -760,6 +1371,32 @@ def compute_whitespace(d):
     return whitespace
 
 
+class PageAggregator(PDFPageAggregator):
+    """PDFPageAggregator which paints each subpath of a path on its
+    own. PDFMiner would otherwise merge all subpaths into one curve,
+    losing where each line or rectangle starts and ends.
+
+    The line width of each curve is also stored in page space as its
+    page_linewidth attribute. PDFMiner keeps it in user space, while
+    the points of the curve are transformed by the CTM.
+    """
+
+    def paint_path(self, gstate, stroke, fill, evenodd, path):
+        subpaths = []
+        for op in path:
+            if op[0] == "m" or not subpaths:
+                subpaths.append([op])
+            else:
+                subpaths[-1].append(op)
+        a, b, c, d, e, f = self.ctm
+        scale = abs(a * d - b * c) ** 0.5
+        for subpath in subpaths:
+            n = len(self.cur_item._objs)
+            PDFPageAggregator.paint_path(self, gstate, stroke, fill, evenodd, subpath)
+            for obj in self.cur_item._objs[n:]:
+                obj.page_linewidth = gstate.linewidth * scale
+
+
 def get_page_layout(
     filename,
     char_margin=1.0,
@@ -774,8 +1411,8 @@ def get_page_layout(
 
     Parameters
     ----------
-    filename : string
-        Path to pdf file.
+    filename : string or file-like object
+        Path to pdf file, or a binary file-like object containing it.
     char_margin : float
     line_margin : float
     word_margin : float
@@ -790,7 +1427,12 @@ def get_page_layout(
         Dimension of pdf page in the form (width, height).
 
     """
-    with open(filename, "rb") as f:
+    if hasattr(filename, "read"):
+        f = filename
+        f.seek(0)
+    else:
+        f = open(filename, "rb")
+    try:
         parser = PDFParser(f)
         document = PDFDocument(parser)
         if not document.is_extractable:
@@ -803,7 +1445,7 @@ def get_page_layout(
             all_texts=all_texts,
         )
         rsrcmgr = PDFResourceManager()
-        device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+        device = PageAggregator(rsrcmgr, laparams=laparams)
         interpreter = PDFPageInterpreter(rsrcmgr, device)
         for page in PDFPage.create_pages(document):
             interpreter.process_page(page)
@@ -811,7 +1453,10 @@ def get_page_layout(
             width = layout.bbox[2]
             height = layout.bbox[3]
             dim = (width, height)
-        return layout, dim
+    finally:
+        if f is not filename:
+            f.close()
+    return layout, dim
 
 
 def get_text_objects(layout, ltype="char", t=None):
@@ -823,8 +1468,10 @@ def get_text_objects(layout, ltype="char", t=None):
     layout : object
         PDFMiner LTPage object.
     ltype : string
-        Specify 'char', 'lh', 'lv' to get LTChar, LTTextLineHorizontal,
-        and LTTextLineVertical objects respectively.
+        Specify 'char', 'image', 'horizontal_text', 'vertical_text'
+        or 'curve' to get LTChar, LTImage, LTTextLineHorizontal,
+        LTTextLineVertical and LTCurve (which includes LTLine and
+        LTRect) objects respectively.
     t : list
 
     Returns
@@ -841,6 +1488,8 @@ def get_text_objects(layout, ltype="char", t=None):
         LTObject = LTTextLineHorizontal
     elif ltype == "vertical_text":
         LTObject = LTTextLineVertical
+    elif ltype == "curve":
+        LTObject = LTCurve
     if t is None:
         t = []
     try:
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import division
+
+import numpy as np
+from pdfminer.layout import LTRect
+
+
+def _is_white(color):
+    """Returns True if a PDFMiner color is white in the gray, RGB or
+    CMYK color spaces.
+    """
+    if color is None:
+        return False
+    if isinstance(color, (int, float)):
+        return color == 1
+    try:
+        color = list(color)
+    except TypeError:
+        return False
+    if len(color) == 4:
+        return all(c == 0 for c in color)
+    return len(color) > 0 and all(c == 1 for c in color)
+
+
+def _get_rect(curve):
+    """Returns the axis-aligned rectangle drawn by a PDFMiner curve, of
+    the form (x0, y0, x1, y1), or None if the curve isn't one.
+    """
+    if isinstance(curve, LTRect):
+        return curve.bbox
+    pts = set(curve.pts)
+    xs = sorted(set(x for x, __ in pts))
+    ys = sorted(set(y for __, y in pts))
+    if len(pts) != 4 or len(xs) != 2 or len(ys) != 2:
+        return None
+    return (xs[0], ys[0], xs[1], ys[1])
+
+
+def _subtract_rect(segments, rect, direction):
+    """Removes the parts of segments of the form (position, start, end)
+    which lie inside a rectangle.
+    """
+    x0, y0, x1, y1 = rect
+    if direction == "vertical":
+        p0, p1, s0, s1 = x0, x1, y0, y1
+    else:
+        p0, p1, s0, s1 = y0, y1, x0, x1
+    remaining = []
+    for position, start, end in segments:
+        if p0 < position < p1 and start < s1 and end > s0:
+            if start < s0:
+                remaining.append((position, start, s0))
+            if end > s1:
+                remaining.append((position, s1, end))
+        else:
+            remaining.append((position, start, end))
+    return remaining
+
+
+def get_segments(curves, max_width=2):
+    """Returns axis-aligned line segments drawn by PDFMiner graphics
+    objects. Objects are processed in the order in which they are
+    painted, so that white fills hide the lines painted before them.
+
+    Parameters
+    ----------
+    curves : list
+        List of PDFMiner LTCurve objects (including LTLine and LTRect).
+    max_width : float, optional (default: 2)
+        Rectangles that are thinner than this many points are treated
+        as a single line. Edges of thicker rectangles are only used if
+        the rectangle is stroked.
+
+    Returns
+    -------
+    vertical : list
+        List of tuples (x, y0, y1) representing vertical segments.
+    horizontal : list
+        List of tuples (y, x0, x1) representing horizontal segments.
+
+    """
+    vertical, horizontal = [], []
+    for c in curves:
+        if not (c.stroke or c.fill):
+            continue
+        rect = _get_rect(c)
+        if not c.stroke and _is_white(c.non_stroking_color):
+            # white fills are invisible, but hide what lies below them
+            if rect is not None:
+                vertical = _subtract_rect(vertical, rect, "vertical")
+                horizontal = _subtract_rect(horizontal, rect, "horizontal")
+            continue
+
+        if rect is None:
+            pts = list(c.pts)
+            if c.fill:
+                pts.append(pts[0])
+            for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+                if abs(x0 - x1) <= 0.1 and y0 != y1:
+                    vertical.append(((x0 + x1) / 2, min(y0, y1), max(y0, y1)))
+                elif abs(y0 - y1) <= 0.1 and x0 != x1:
+                    horizontal.append(((y0 + y1) / 2, min(x0, x1), max(x0, x1)))
+            continue
+
+        x0, y0, x1, y1 = rect
+        width, height = x1 - x0, y1 - y0
+        if width <= max_width and height > width:
+            vertical.append(((x0 + x1) / 2, y0, y1))
+        elif height <= max_width and width > height:
+            horizontal.append(((y0 + y1) / 2, x0, x1))
+        elif c.stroke and width > 0 and height > 0:
+            # filled rectangles are cell backgrounds, not ruling lines
+            vertical.extend([(x0, y0, y1), (x1, y0, y1)])
+            horizontal.extend([(y0, x0, x1), (y1, x0, x1)])
+    return vertical, horizontal
+
+
+def _clip_segments(segments, regions, direction):
+    """Clips segments of the form (position, start, end) to regions
+    of the form (x1, y1, x2, y2) where (x1, y1) -> lb and (x2, y2) -> rt.
+    """
+    clipped = []
+    for x1, y1, x2, y2 in regions:
+        if direction == "vertical":
+            p1, p2, s1, s2 = x1, x2, y1, y2
+        else:
+            p1, p2, s1, s2 = y1, y2, x1, x2
+        for position, start, end in segments:
+            if p1 <= position <= p2:
+                start, end = max(start, s1), min(end, s2)
+                if start < end:
+                    clipped.append((position, start, end))
+    return clipped
+
+
+def _merge_segments(segments, line_tol=2):
+    """Merges segments of the form (position, start, end) which lie on
+    the same line and overlap or touch each other.
+    """
+    if not segments:
+        return []
+    segments = np.asarray(segments, dtype=float)
+    segments = segments[np.argsort(segments[:, 0], kind="mergesort")]
+    # segments whose positions are close lie on the same line
+    groups = np.concatenate([[0], np.cumsum(np.diff(segments[:, 0]) > line_tol)])
+
+    merged = []
+    for g in range(groups[-1] + 1):
+        group = segments[groups == g]
+        position = group[:, 0].mean()
+        group = group[np.argsort(group[:, 1], kind="mergesort")]
+        start, end = group[0, 1], group[0, 2]
+        for s, e in group[1:, 1:]:
+            if s <= end + line_tol:
+                end = max(end, e)
+            else:
+                merged.append((position, start, end))
+                start, end = s, e
+        merged.append((position, start, end))
+    return merged
+
+
+def find_lines(
+    curves,
+    pdf_width,
+    pdf_height,
+    regions=None,
+    direction="horizontal",
+    line_scale=15,
+    line_tol=2,
+):
+    """Finds horizontal and vertical lines drawn by PDFMiner graphics
+    objects.
+
+    Parameters
+    ----------
+    curves : list
+        List of PDFMiner LTCurve objects (including LTLine and LTRect).
+    pdf_width : float
+        Width of the PDF page.
+    pdf_height : float
+        Height of the PDF page.
+    regions : list, optional (default: None)
+        List of page regions that may contain tables of the form x1,y1,x2,y2
+        where (x1, y1) -> lb and (x2, y2) -> rt in PDF coordinate space.
+    direction : string, optional (default: 'horizontal')
+        Specifies whether to find vertical or horizontal lines.
+    line_scale : int, optional (default: 15)
+        Factor by which the page dimensions will be divided to get
+        smallest length of lines that should be detected.
+    line_tol : int, optional (default: 2)
+        Tolerance parameter used to merge segments which lie on the
+        same line.
+
+    Returns
+    -------
+    lines : list
+        List of tuples representing vertical/horizontal lines of the
+        form (x1, y1, x2, y2) where (x1, y1) -> lb and (x2, y2) -> rt
+        in PDF coordinate space.
+
+    """
+    vertical, horizontal = get_segments(curves)
+    if direction == "vertical":
+        segments, min_length = vertical, pdf_height / line_scale
+    elif direction == "horizontal":
+        segments, min_length = horizontal, pdf_width / line_scale
+    else:
+        raise ValueError("Specify direction as either 'vertical' or 'horizontal'")
+
+    if regions is not None:
+        segments = _clip_segments(segments, regions, direction)
+    segments = _merge_segments(segments, line_tol=line_tol)
+
+    lines = []
+    for position, start, end in segments:
+        if end - start < min_length:
+            continue
+        if direction == "vertical":
+            lines.append((position, start, position, end))
+        else:
+            lines.append((start, position, end, position))
+    return lines
+
+
+def _find_intersections(vertical, horizontal, joint_tol=2):
+    """Returns the indices of vertical and horizontal lines which
+    intersect each other, and the intersection points.
+    """
+    v = np.asarray(vertical, dtype=float).reshape(-1, 4)
+    h = np.asarray(horizontal, dtype=float).reshape(-1, 4)
+    vx, vy1, vy2 = v[:, 0, None], v[:, 1, None], v[:, 3, None]
+    hy, hx1, hx2 = h[None, :, 1], h[None, :, 0], h[None, :, 2]
+    intersects = (
+        (hx1 - joint_tol <= vx)
+        & (vx <= hx2 + joint_tol)
+        & (vy1 - joint_tol <= hy)
+        & (hy <= vy2 + joint_tol)
+    )
+    v_idx, h_idx = np.nonzero(intersects)
+    points = np.column_stack([v[v_idx, 0], h[h_idx, 1]])
+    return v_idx, h_idx, points
+
+
+def find_contours(vertical, horizontal, joint_tol=2):
+    """Finds table boundaries by grouping lines which intersect each
+    other.
+
+    Parameters
+    ----------
+    vertical : list
+        List of tuples representing vertical lines.
+    horizontal : list
+        List of tuples representing horizontal lines.
+    joint_tol : int, optional (default: 2)
+        Tolerance parameter used to decide whether two lines
+        intersect.
+
+    Returns
+    -------
+    cont : list
+        List of tuples representing table boundaries. Each tuple is of
+        the form (x1, y1, x2, y2) where (x1, y1) -> lb and (x2, y2) -> rt
+        in PDF coordinate space.
+
+    """
+    lines = list(vertical) + list(horizontal)
+    v_idx, h_idx, __ = _find_intersections(vertical, horizontal, joint_tol=joint_tol)
+
+    parent = list(range(len(lines)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(v_idx, h_idx + len(vertical)):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[ri] = rj
+
+    groups = {}
+    for i, line in enumerate(lines):
+        groups.setdefault(find(i), []).append(line)
+
+    cont = []
+    for group in groups.values():
+        group = np.asarray(group)
+        cont.append(
+            (
+                float(group[:, 0].min()),
+                float(group[:, 1].min()),
+                float(group[:, 2].max()),
+                float(group[:, 3].max()),
+            )
+        )
+    # sort in reverse based on area and use first 10 boundaries
+    cont = sorted(cont, key=lambda c: (c[2] - c[0]) * (c[3] - c[1]), reverse=True)
+    return cont[:10]
+
+
+def find_joints(contours, vertical, horizontal, joint_tol=2):
+    """Finds joints/intersections present inside each table boundary.
+
+    Parameters
+    ----------
+    contours : list
+        List of tuples representing table boundaries. Each tuple is of
+        the form (x1, y1, x2, y2) where (x1, y1) -> lb and (x2, y2) -> rt
+        in PDF coordinate space.
+    vertical : list
+        List of tuples representing vertical lines.
+    horizontal : list
+        List of tuples representing horizontal lines.
+    joint_tol : int, optional (default: 2)
+        Tolerance parameter used to decide whether two lines
+        intersect.
+
+    Returns
+    -------
+    tables : dict
+        Dict with table boundaries as keys and list of intersections
+        in that boundary as their value.
+        Keys are of the form (x1, y1, x2, y2) where (x1, y1) -> lb
+        and (x2, y2) -> rt in PDF coordinate space.
+
+    """
+    __, __, points = _find_intersections(vertical, horizontal, joint_tol=joint_tol)
+    tables = {}
+    for c in contours:
+        x1, y1, x2, y2 = c
+        inside = (
+            (x1 <= points[:, 0])
+            & (points[:, 0] <= x2)
+            & (y1 <= points[:, 1])
+            & (points[:, 1] <= y2)
+        )
+        joint_coords = sorted(set(map(tuple, points[inside].tolist())))
+        if len(joint_coords) <= 4:  # remove contours with less than 4 joints
+            continue
+        tables[tuple(c)] = joint_coords
+
+    return tables
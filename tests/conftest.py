@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+
+import pytest
+
+
+testdir = os.path.dirname(os.path.abspath(__file__))
+testdir = os.path.join(testdir, "files")
+
+# camelot.aio and its tests use async syntax, which doesn't compile
+# before Python 3.5
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append("test_aio.py")
+
+
+@pytest.fixture
+def server():
+    """Serves the test files over HTTP on localhost, directly or as
+    an HTTP proxy.
+    """
+    try:
+        from http.server import HTTPServer, SimpleHTTPRequestHandler
+        from socketserver import ThreadingMixIn
+        from urllib.parse import urlsplit
+    except ImportError:
+        pytest.skip("requires Python 3")
+
+    # downloads keep connections open, which would block a server
+    # that handles one connection at a time
+    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    class PDFRequestHandler(SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        extensions_map = {".pdf": "application/pdf", "": "application/octet-stream"}
+
+        def translate_path(self, path):
+            # requests sent to the server as a proxy carry the whole URL
+            path = urlsplit(path).path
+            path = SimpleHTTPRequestHandler.translate_path(self, path)
+            return os.path.join(testdir, os.path.relpath(path, os.getcwd()))
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PDFRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{}".format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
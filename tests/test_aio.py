@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pandas as pd
+
+import camelot
+from camelot import aio
+
+from .data import *
+
+
+testdir = os.path.dirname(os.path.abspath(__file__))
+testdir = os.path.join(testdir, "files")
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_aio_read_pdf_url(server):
+    df = pd.DataFrame(data_stream)
+
+    url = "{}/health.pdf".format(server)
+    tables = run(aio.read_pdf(url, flavor="stream"))
+    assert df.equals(tables[0].df)
+
+
+def test_aio_read_pdf_pages():
+    filename = os.path.join(testdir, "tabula/schools.pdf")
+    tables = camelot.read_pdf(filename, flavor="stream", pages="all")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        aio_tables = run(
+            aio.read_pdf(
+                filename,
+                flavor="stream",
+                pages="all",
+                executor=executor,
+                concurrency=2,
+            )
+        )
+    assert [(t.page, t.order) for t in tables] == [
+        (t.page, t.order) for t in aio_tables
+    ]
+    for t, aio_t in zip(tables, aio_tables):
+        assert t.df.equals(aio_t.df)
+
+
+def test_aio_read_pdf_cancel():
+    filename = os.path.join(testdir, "tabula/schools.pdf")
+
+    async def cancel():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.ensure_future(
+                aio.read_pdf(
+                    filename,
+                    flavor="stream",
+                    pages="all",
+                    executor=executor,
+                    concurrency=1,
+                )
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    run(cancel())
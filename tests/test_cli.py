@@ -46,6 +46,19 @@ def test_cli_lattice():
         assert format_error in result.output
 
 
+def test_cli_lattice_resolution():
+    with TemporaryDirectory() as tempdir:
+        infile = os.path.join(testdir, "foo.pdf")
+        outfile = os.path.join(tempdir, "foo.csv")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["--format", "csv", "--output", outfile, "lattice", "-res", "30O", infile],
+        )
+        assert result.exit_code == 2
+        assert "30O is not an integer or 'auto'" in result.output
+
+
 def test_cli_stream():
     with TemporaryDirectory() as tempdir:
         infile = os.path.join(testdir, "budget.pdf")
@@ -1,11 +1,34 @@
 # -*- coding: utf-8 -*-
 
+import io
 import os
+import threading
 
+import numpy as np
 import pandas as pd
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject, NumberObject
 
 import camelot
-from camelot.core import Table, TableList
+from camelot.core import Table, TableList, TextEdges
+from camelot.handlers import PDFHandler
+from camelot.backends import get_backend
+from camelot.image_processing import read_grayscale
+from camelot.cache import PageCache
+from camelot.parsers import Lattice, Stream
+from camelot.utils import (
+    PY3,
+    CellIndex,
+    SegmentIndex,
+    TemporaryDirectory,
+    TextIndex,
+    TextLineTable,
+    get_page_layout,
+    get_text_objects,
+    merge_close_lines,
+    segments_in_bbox,
+    text_in_bbox,
+)
 
 from .data import *
 
@@ -141,6 +164,27 @@ def test_stream_layout_kwargs():
     assert df.equals(tables[0].df)
 
 
+def test_stream_parallel():
+    filename = os.path.join(testdir, "tabula/schools.pdf")
+    tables = camelot.read_pdf(filename, flavor="stream", pages="all")
+    parallel_tables = camelot.read_pdf(
+        filename, flavor="stream", pages="all", parallel=True, workers=2
+    )
+
+    assert len(tables) == len(parallel_tables)
+    for t, pt in zip(tables, parallel_tables):
+        assert (t.page, t.order) == (pt.page, pt.order)
+        assert t.df.equals(pt.df)
+
+
+def test_stream_in_memory():
+    df = pd.DataFrame(data_stream_table_rotated)
+
+    filename = os.path.join(testdir, "clockwise_table_2.pdf")
+    tables = camelot.read_pdf(filename, flavor="stream", in_memory=True)
+    assert df.equals(tables[0].df)
+
+
 def test_lattice():
     df = pd.DataFrame(data_lattice)
 
@@ -163,6 +207,136 @@ def test_lattice_table_rotated():
     assert df.equals(tables[0].df)
 
 
+def test_lattice_batch_render():
+    df = pd.DataFrame(data_lattice)
+
+    filename = os.path.join(
+        testdir, "tabula/icdar2013-dataset/competition-dataset-us/us-030.pdf"
+    )
+    tables = camelot.read_pdf(filename, pages="1,2", batch_render=True)
+    assert df.equals(tables[-1].df)
+
+    filename = os.path.join(testdir, "clockwise_table_1.pdf")
+    tables = camelot.read_pdf(filename, batch_render=True)
+    assert pd.DataFrame(data_lattice_table_rotated).equals(tables[0].df)
+
+
+def test_lattice_batch_render_cache(monkeypatch):
+    df = pd.DataFrame(data_lattice)
+
+    filename = os.path.join(
+        testdir, "tabula/icdar2013-dataset/competition-dataset-us/us-030.pdf"
+    )
+    rendered = []
+    render_pages = Lattice.render_pages
+
+    def record_render_pages(self, filepath, pages, *args, **kwargs):
+        rendered.append(pages)
+        return render_pages(self, filepath, pages, *args, **kwargs)
+
+    monkeypatch.setattr(Lattice, "render_pages", record_render_pages)
+    with TemporaryDirectory() as tempdir:
+        tables = camelot.read_pdf(
+            filename, pages="1,2", batch_render=True, cache=tempdir
+        )
+        assert df.equals(tables[-1].df)
+        # cached pages are not rendered again
+        tables = camelot.read_pdf(
+            filename, pages="1,2", batch_render=True, cache=tempdir
+        )
+        assert df.equals(tables[-1].df)
+    assert rendered == [[1, 2]]
+
+
+def test_lattice_backend_threads():
+    filename = os.path.join(testdir, "foo.pdf")
+
+    for name in ["ghostscript", "ghostscript_subprocess"]:
+        backend = get_backend(name)
+        with TemporaryDirectory() as tempdir:
+            imagenames = [
+                os.path.join(tempdir, "page-{}.pgm".format(i)) for i in range(8)
+            ]
+            errors = []
+
+            def render(imagename):
+                try:
+                    backend.render(filename, imagename, 72)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [
+                threading.Thread(target=render, args=(imagename,))
+                for imagename in imagenames
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if errors:
+                raise errors[0]
+
+            images = [read_grayscale(imagename) for imagename in imagenames]
+            assert images[0] is not None
+            for image in images[1:]:
+                assert (image == images[0]).all()
+
+
+def test_lattice_backend_pipe():
+    filename = os.path.join(testdir, "foo.pdf")
+
+    backend = get_backend("ghostscript_subprocess")
+    with TemporaryDirectory() as tempdir:
+        imagename = os.path.join(tempdir, "page-1.pgm")
+        backend.render(filename, imagename, 72)
+        image = read_grayscale(imagename)
+    assert (backend.render_array(filename, 72) == image).all()
+
+    tables = camelot.read_pdf(filename, backend="ghostscript_subprocess")
+    assert pd.DataFrame(data_lattice).equals(tables[0].df)
+
+
+def _make_pdf(content):
+    # single 200x200 page with the given content stream
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Contents 4 0 R >>",
+        b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n"
+        + content + b"\nendstream",
+    ]
+    f = io.BytesIO()
+    f.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(f.tell())
+        f.write(str(i + 1).encode() + b" 0 obj\n" + obj + b"\nendobj\n")
+    xref = f.tell()
+    f.write(b"xref\n0 " + str(len(objects) + 1).encode() + b"\n")
+    f.write(b"0000000000 65535 f \n")
+    for offset in offsets:
+        f.write("{:010d} 00000 n \n".format(offset).encode())
+    f.write(b"trailer\n<< /Size " + str(len(objects) + 1).encode() + b" /Root 1 0 R >>\n")
+    f.write(b"startxref\n" + str(xref).encode() + b"\n%%EOF\n")
+    f.seek(0)
+    return f
+
+
+def test_lattice_resolution():
+    # 2pt lines drawn at a quarter of their size are 0.5pt wide on the
+    # page, which needs 150 dpi to be at least a pixel wide
+    content = b"0.25 0 0 0.25 0 0 cm 2 w 40 40 m 600 40 l S 40 40 m 40 600 l S"
+    layout, dim = get_page_layout(_make_pdf(content))
+
+    parser = Lattice(resolution="auto")
+    parser.layout = layout
+    assert parser._get_resolution() == 150
+    parser = Lattice(resolution=200)
+    parser.layout = layout
+    assert parser._get_resolution() == 200
+    assert parser._image_key() == (200, "ghostscript")
+
+
 def test_lattice_two_tables():
     df1 = pd.DataFrame(data_lattice_two_tables_1)
     df2 = pd.DataFrame(data_lattice_two_tables_2)
@@ -174,6 +348,17 @@ def test_lattice_two_tables():
     assert df2.equals(tables[1].df)
 
 
+def test_lattice_line_source_vector():
+    df1 = pd.DataFrame(data_lattice_two_tables_1)
+    df2 = pd.DataFrame(data_lattice_two_tables_2)
+
+    filename = os.path.join(testdir, "twotables_2.pdf")
+    tables = camelot.read_pdf(filename, line_source="vector")
+    assert len(tables) == 2
+    assert df1.equals(tables[0].df)
+    assert df2.equals(tables[1].df)
+
+
 def test_lattice_table_regions():
     df = pd.DataFrame(data_lattice_table_regions)
 
@@ -297,3 +482,456 @@ def test_table_order():
         (1, 2),
         (1, 1),
     ]
+
+
+def test_table_cells():
+    table = Table([(0, 10), (10, 20)], [(20, 10), (10, 0)])
+    table = table.set_border().set_span()
+    table.cells[-1][-1].text = "a"
+    table.cells[1][1].text = "b"
+
+    assert table.data == [["", ""], ["", "ab"]]
+    assert table.cells[0][0].left and not table.cells[0][1].left
+    assert table.cells[0][0].bound == 2 and table.cells[0][0].hspan is False
+    assert table.cells[1][0].lb == (0, 0)
+    assert [cell.x1 for cell in table.cells[0][-2:]] == [0, 10]
+    assert len(table.cells[:1]) == 1
+
+    table.set_text(0, 1, "c")
+    assert table.cells[0][1].text == "c"
+
+
+def _page_text(filename):
+    layout, dim = get_page_layout(os.path.join(testdir, filename))
+    text = get_text_objects(layout, ltype="horizontal_text")
+    return text, dim
+
+
+def test_text_line_table():
+    text, (width, height) = _page_text("tabula/12s0324.pdf")
+    lines = TextLineTable(text)
+    xs = np.linspace(0, width, 9)
+    ys = np.linspace(height, 0, 41)
+    table = Table(list(zip(xs[:-1], xs[1:])), list(zip(ys[:-1], ys[1:])))
+
+    text = text[::-1]
+    sub = lines.lookup(text)
+    assert sub.textlines == text
+    assert sub.x0.tolist() == [t.x0 for t in text]
+    assert sub.text == [t.get_text() for t in text]
+
+    cell_index = CellIndex(table)
+    cells = [
+        cell_index._locate_linear(t, t.x0, (t.y0 + t.y1) / 2.0, t.x1) for t in text
+    ]
+    assert cell_index.locate(text, lines=lines) == cells
+    assert cell_index.locate(text) == cells
+
+    assert Stream._group_rows(text, lines=lines) == Stream._group_rows(text)
+
+
+def _set_edges_loop(table, vertical, horizontal, joint_tol=2):
+    # Table.set_edges as it was before segments were matched to the
+    # grid with array operations
+    for v in vertical:
+        i = [
+            i
+            for i, t in enumerate(table.cols)
+            if np.isclose(v[0], t[0], atol=joint_tol)
+        ]
+        j = [
+            j
+            for j, t in enumerate(table.rows)
+            if np.isclose(v[3], t[0], atol=joint_tol)
+        ]
+        k = [
+            k
+            for k, t in enumerate(table.rows)
+            if np.isclose(v[1], t[0], atol=joint_tol)
+        ]
+        if not j:
+            continue
+        for J in range(j[0], k[0] if k else len(table.rows)):
+            if i == [0]:
+                table.cells[J][0].left = True
+            elif i == []:
+                table.cells[J][len(table.cols) - 1].right = True
+            else:
+                table.cells[J][i[0]].left = True
+                table.cells[J][i[0] - 1].right = True
+    for h in horizontal:
+        i = [
+            i
+            for i, t in enumerate(table.rows)
+            if np.isclose(h[1], t[0], atol=joint_tol)
+        ]
+        j = [
+            j
+            for j, t in enumerate(table.cols)
+            if np.isclose(h[0], t[0], atol=joint_tol)
+        ]
+        k = [
+            k
+            for k, t in enumerate(table.cols)
+            if np.isclose(h[2], t[0], atol=joint_tol)
+        ]
+        if not j:
+            continue
+        for J in range(j[0], k[0] if k else len(table.cols)):
+            if i == [0]:
+                table.cells[0][J].top = True
+            elif i == []:
+                table.cells[len(table.rows) - 1][J].bottom = True
+            else:
+                table.cells[i[0]][J].top = True
+                table.cells[i[0] - 1][J].bottom = True
+    return table
+
+
+def test_table_set_edges():
+    rng = np.random.RandomState(0)
+    xs = np.cumsum(rng.choice([3, 20, 40], 21))
+    ys = np.cumsum(rng.choice([3, 10, 15], 31))[::-1]
+    cols, rows = list(zip(xs[:-1], xs[1:])), list(zip(ys[:-1], ys[1:]))
+
+    def near(values, n):
+        # grid coordinates moved by up to twice the joint tolerance
+        return rng.choice(values, n) + rng.uniform(-4, 4, n)
+
+    n = 300
+    x, x0, x1 = near(xs, n), near(xs, n), near(xs, n)
+    y, y0, y1 = near(ys, n), near(ys, n), near(ys, n)
+    vertical = list(zip(x, np.minimum(y0, y1), x, np.maximum(y0, y1)))
+    horizontal = list(zip(np.minimum(x0, x1), y, np.maximum(x0, x1), y))
+
+    table = Table(cols, rows).set_edges(vertical, horizontal, joint_tol=2)
+    expected = _set_edges_loop(Table(cols, rows), vertical, horizontal, joint_tol=2)
+    for name in ["_left", "_right", "_top", "_bottom"]:
+        assert (getattr(table, name) == getattr(expected, name)).all()
+    assert table._left.any() and table._bottom.any()
+
+
+class _TextLine(object):
+    def __init__(self, x0, y0, x1, y1, text):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.text = text
+
+    def get_text(self):
+        return self.text
+
+
+class _LinearTextEdges(TextEdges):
+    # TextEdges.find as it was before text edges were indexed on x
+    def find(self, x_coord, align):
+        for i, te in enumerate(self._textedges[align]):
+            if np.isclose(te.x, x_coord, atol=0.5):
+                return i
+        return None
+
+
+def test_text_edges():
+    text, __ = _page_text("tabula/12s0324.pdf")
+    text = [_TextLine(t.x0, t.y0, t.x1, t.y1, t.get_text()) for t in text]
+    # shifted copies of text lines, many of which fall just inside or
+    # outside the tolerance of an existing text edge
+    rng = np.random.RandomState(0)
+    for t in text[:300]:
+        dx = rng.uniform(-1, 1)
+        text.append(_TextLine(t.x0 + dx, t.y0 - 1, t.x1 + dx, t.y1 - 1, t.text))
+
+    textedges = TextEdges(edge_tol=50)
+    textedges.generate(text)
+    expected = _LinearTextEdges(edge_tol=50)
+    expected.generate(text)
+    for align in ["left", "right", "middle"]:
+        edges = [
+            (te.x, te.y0, te.y1, te.intersections, te.is_valid)
+            for te in textedges._textedges[align]
+        ]
+        assert edges == [
+            (te.x, te.y0, te.y1, te.intersections, te.is_valid)
+            for te in expected._textedges[align]
+        ]
+        assert len(edges) > 10
+
+
+def _group_rows_loop(text, row_tol=2):
+    # Stream._group_rows as it was before it used group_close
+    row_y = 0
+    rows = []
+    temp = []
+    for t in text:
+        if t.get_text().strip():
+            if not np.isclose(row_y, t.y0, atol=row_tol):
+                rows.append(sorted(temp, key=lambda t: t.x0))
+                temp = []
+                row_y = t.y0
+            temp.append(t)
+    rows.append(sorted(temp, key=lambda t: t.x0))
+    __ = rows.pop(0)
+    return rows
+
+
+def _merge_columns_loop(l, column_tol=0):
+    # Stream._merge_columns as it was before it compared tolerances
+    # without np.isclose
+    merged = []
+    for higher in l:
+        if not merged:
+            merged.append(higher)
+            continue
+        lower = merged[-1]
+        if column_tol >= 0:
+            if higher[0] <= lower[1] or np.isclose(
+                higher[0], lower[1], atol=column_tol
+            ):
+                merged[-1] = (min(lower[0], higher[0]), max(lower[1], higher[1]))
+            else:
+                merged.append(higher)
+        elif higher[0] <= lower[1]:
+            if np.isclose(higher[0], lower[1], atol=abs(column_tol)):
+                merged.append(higher)
+            else:
+                merged[-1] = (min(lower[0], higher[0]), max(lower[1], higher[1]))
+        else:
+            merged.append(higher)
+    return merged
+
+
+def _merge_close_lines_loop(ar, line_tol=2):
+    # merge_close_lines as it was before it used group_close
+    ret = []
+    for a in ar:
+        if ret and np.isclose(ret[-1], a, atol=line_tol):
+            ret[-1] = (ret[-1] + a) / 2.0
+        else:
+            ret.append(a)
+    return ret
+
+
+def test_tolerance_grouping():
+    rng = np.random.RandomState(0)
+    n = 500
+    ys = 800 - np.cumsum(rng.choice([0, 0.5, 1.5, 2, 2.5, 3, 12], n))
+    x0s = rng.uniform(0, 500, n)
+    text = [
+        _TextLine(x0, y, x0 + 50, y + 8, rng.choice(["", "a"]))
+        for x0, y in zip(x0s, ys)
+    ]
+    assert Stream._group_rows(text, row_tol=2) == _group_rows_loop(text, row_tol=2)
+
+    starts = np.sort(rng.uniform(0, 600, n))
+    cols = [(x, x + w) for x, w in zip(starts, rng.uniform(0, 10, n))]
+    for column_tol in [0, 3, -3]:
+        assert Stream._merge_columns(cols, column_tol) == _merge_columns_loop(
+            cols, column_tol
+        )
+
+    lines = np.sort(
+        np.concatenate([rng.uniform(0, 600, n), rng.choice(range(0, 600, 3), n)])
+    ).tolist()
+    assert merge_close_lines(lines, 2) == _merge_close_lines_loop(lines, 2)
+
+
+def test_cell_index():
+    filename = os.path.join(testdir, "tabula/12s0324.pdf")
+    table = camelot.read_pdf(filename, flavor="stream")[0]
+    text, __ = _page_text("tabula/12s0324.pdf")
+
+    cell_index = CellIndex(table)
+    cells = cell_index.locate(text)
+    assert (-1, -1) in cells and len(set(cells)) > 100
+    assert cells == [
+        cell_index._locate_linear(t, t.x0, (t.y0 + t.y1) / 2.0, t.x1) for t in text
+    ]
+
+
+def test_bbox_index():
+    text, (width, height) = _page_text("tabula/12s0324.pdf")
+    text_index = TextIndex(TextLineTable(text))
+    rng = np.random.RandomState(0)
+    segments = rng.uniform(0, width, (200, 4))
+    v_segments = [(x, y0, x, y0 + h) for x, y0, __, h in segments]
+    h_segments = [(x0, y, x0 + w, y) for x0, y, w, __ in segments]
+    segment_index = SegmentIndex(v_segments, h_segments)
+
+    for __ in range(50):
+        x0, x1 = sorted(rng.uniform(0, width, 2))
+        y0, y1 = sorted(rng.uniform(0, height, 2))
+        bbox = (x0, y0, x1, y1)
+        assert text_index.in_bbox(bbox) == text_in_bbox(bbox, text)
+        assert segment_index.in_bbox(bbox) == segments_in_bbox(
+            bbox, v_segments, h_segments
+        )
+
+
+def test_iter_pdf():
+    filename = os.path.join(testdir, "tabula/schools.pdf")
+    tables = camelot.read_pdf(filename, flavor="stream", pages="1-3")
+    iter_tables = camelot.iter_pdf(filename, flavor="stream", pages="1-3")
+
+    assert not isinstance(iter_tables, list)
+    iter_tables = list(iter_tables)
+    assert len(tables) == len(iter_tables)
+    for t, it in zip(tables, iter_tables):
+        assert (t.page, t.order) == (it.page, it.order)
+        assert t.df.equals(it.df)
+
+
+def test_cache():
+    df = pd.DataFrame(data_stream)
+
+    filename = os.path.join(testdir, "health.pdf")
+    with TemporaryDirectory() as tempdir:
+        tables = camelot.read_pdf(filename, flavor="stream", cache=tempdir)
+        assert os.listdir(tempdir)
+        cached_tables = camelot.read_pdf(filename, flavor="stream", cache=tempdir)
+    assert df.equals(tables[0].df)
+    assert df.equals(cached_tables[0].df)
+
+
+def test_cache_eviction():
+    with TemporaryDirectory() as tempdir:
+        cache = PageCache(tempdir, max_size=2500)
+        for i in range(3):
+            cache.put(b"x" * 1000, i)
+        assert cache.get(0) is None
+        assert cache.get(1) is not None
+        cache.put(b"x" * 1000, 3)
+        assert cache.get(1) is not None
+        assert cache.get(2) is None
+
+        directory = os.path.join(tempdir, "cache")
+        PageCache(directory)
+        if os.name == "posix":
+            assert os.stat(directory).st_mode & 0o777 == 0o700
+
+
+def test_sweep():
+    df = pd.DataFrame(data_stream)
+
+    filename = os.path.join(testdir, "health.pdf")
+    results = camelot.sweep(
+        filename, flavor="stream", param_grid={"row_tol": [2, 10], "edge_tol": [50]}
+    )
+    assert [r["params"] for r in results] == [
+        {"row_tol": 2, "edge_tol": 50},
+        {"row_tol": 10, "edge_tol": 50},
+    ]
+    assert df.equals(results[0]["tables"][0].df)
+    assert results[0]["parsing_report"] == [results[0]["tables"][0].parsing_report]
+
+
+def test_read_pdf_local_url(server):
+    df = pd.DataFrame(data_stream)
+
+    url = "{}/health.pdf".format(server)
+    tables = camelot.read_pdf(url, flavor="stream")
+    assert df.equals(tables[0].df)
+    # connections are reused across downloads
+    tables = camelot.read_pdf(url, flavor="stream")
+    assert df.equals(tables[0].df)
+
+
+def test_read_pdf_url_proxy(server, monkeypatch):
+    df = pd.DataFrame(data_stream)
+
+    monkeypatch.setenv("http_proxy", server)
+    monkeypatch.delenv("no_proxy", raising=False)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    # the host can only be reached through the proxy
+    tables = camelot.read_pdf("http://camelot.invalid/health.pdf", flavor="stream")
+    assert df.equals(tables[0].df)
+
+
+def test_read_pdf_bytes_and_fileobj():
+    df = pd.DataFrame(data_stream)
+
+    filename = os.path.join(testdir, "health.pdf")
+    with open(filename, "rb") as f:
+        data = f.read()
+        tables = camelot.read_pdf(f, flavor="stream")
+        assert not f.closed
+    assert df.equals(tables[0].df)
+    if PY3:
+        tables = camelot.read_pdf(data, flavor="stream", in_memory=True)
+        assert df.equals(tables[0].df)
+    tables = camelot.read_pdf(bytearray(data), flavor="stream")
+    assert df.equals(tables[0].df)
+    tables = camelot.read_pdf(memoryview(data), flavor="stream")
+    assert df.equals(tables[0].df)
+
+    # paths are never taken as contents
+    handler = PDFHandler(filename)
+    assert handler.filepath == filename
+    handler.close()
+
+
+def test_read_pdf_mmap():
+    df = pd.DataFrame(data_stream)
+
+    filename = os.path.join(testdir, "health.pdf")
+    tables = camelot.read_pdf(filename, flavor="stream", use_mmap=True)
+    assert df.equals(tables[0].df)
+
+
+def test_page_ranges():
+    filename = os.path.join(testdir, "tabula/schools.pdf")
+    handler = PDFHandler(filename, pages="3,1-2,2-end")
+    assert handler._page_ranges == [(1, 2), (2, None), (3, 3)]
+
+    pages = handler._iter_page_numbers()
+    assert [next(pages), next(pages), next(pages)] == [1, 2, 3]
+    assert handler.pages == list(range(1, 6))
+    assert handler._get_infile().flattenedPages is None
+
+
+def _write_nested_pdf(filename, root_count, subtree_count=2):
+    # pages 1 and 2 of schools.pdf are in a subtree, followed by page 3
+    # and an empty subtree
+    infile = PdfFileReader(os.path.join(testdir, "tabula/schools.pdf"), strict=False)
+    outfile = PdfFileWriter()
+    for i in range(3):
+        outfile.addPage(infile.getPage(i))
+    root = outfile.getObject(outfile._pages)
+    p1, p2, p3 = root["/Kids"]
+
+    def pages_node(kids):
+        node = DictionaryObject()
+        node[NameObject("/Type")] = NameObject("/Pages")
+        node[NameObject("/Kids")] = ArrayObject(kids)
+        node[NameObject("/Count")] = NumberObject(len(kids))
+        node[NameObject("/Parent")] = outfile._pages
+        return outfile._addObject(node)
+
+    subtree = pages_node([p1, p2])
+    subtree.getObject()[NameObject("/Count")] = NumberObject(subtree_count)
+    for page in [p1, p2]:
+        page.getObject()[NameObject("/Parent")] = subtree
+    root[NameObject("/Kids")] = ArrayObject([subtree, p3, pages_node([])])
+    root[NameObject("/Count")] = NumberObject(root_count)
+    with open(filename, "wb") as f:
+        outfile.write(f)
+    return [infile.getPage(i).extractText() for i in range(3)]
+
+
+def test_page_tree():
+    with TemporaryDirectory() as tempdir:
+        filename = os.path.join(tempdir, "nested.pdf")
+        # the root page count is right, too small and too large
+        for root_count in [3, 2, 5]:
+            texts = _write_nested_pdf(filename, root_count)
+            handler = PDFHandler(filename, pages="all")
+            assert handler.pages == [1, 2, 3]
+            assert [handler._get_page(p).extractText() for p in [1, 2, 3]] == texts
+            handler.close()
+        # the page count of the subtree is too small and too large
+        for subtree_count in [1, 3]:
+            texts = _write_nested_pdf(filename, 3, subtree_count=subtree_count)
+            handler = PDFHandler(filename, pages="1-3")
+            assert handler.pages == [1, 2, 3]
+            assert [handler._get_page(p).extractText() for p in [1, 2, 3]] == texts
+            handler.close()
+            handler = PDFHandler(filename, pages="all")
+            assert handler.pages == [1, 2, 3]
+            handler.close()
@@ -95,3 +95,18 @@ def test_bad_password():
     message = 'file has not been decrypted'
     with pytest.raises(Exception, match=message):
         tables = camelot.read_pdf(filename, password='wrongpass')
+
+
+def test_plot_without_debug_data():
+    filename = os.path.join(testdir, 'health.pdf')
+    tables = camelot.read_pdf(filename, flavor='stream', keep_debug_data=False)
+    message = 'keep_debug_data=False'
+    with pytest.raises(ValueError, match=message):
+        camelot.plot(tables[0], kind='text')
+
+
+def test_download_max_size(server):
+    url = '{}/health.pdf'.format(server)
+    message = 'File is larger than 1000 bytes'
+    with pytest.raises(ValueError, match=message):
+        camelot.utils.download_url(url, max_size=1000)